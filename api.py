@@ -4,28 +4,92 @@ Habit Exposer API
 Simple REST API to access stats
 
 Run: uvicorn api:app --reload
+     (production: uvicorn api:app --loop uvloop --http httptools)
 Access: http://localhost:8000/stats
 """
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import asyncio
+import orjson
 import sys
+import time
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from storage.database import DatabaseManager
+from storage.async_database import DatabaseManagerAsync
 from utils.config import Config
 
-app = FastAPI(title="Habit Exposer API", version="1.0.0")
 
-# Initialize database
-config = Config.load()
-db = DatabaseManager(config.storage.database_path)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the database connection pool for the lifetime of the app."""
+    config = Config.load()
+    app.state.db = await DatabaseManagerAsync.create(
+        config.storage.database_path, min_size=2, max_size=10)
+    try:
+        yield
+    finally:
+        await app.state.db.close()
+
+
+app = FastAPI(title="Habit Exposer API", version="1.0.0",
+              default_response_class=ORJSONResponse, lifespan=lifespan)
+
+
+def get_db(request: Request) -> DatabaseManagerAsync:
+    """Dependency returning the pooled database manager."""
+    return request.app.state.db
+
+
+# Response cache: (endpoint, params) -> (expiry on the monotonic clock, JSON bytes).
+# Events arrive every few seconds at most, so short TTLs absorb dashboard polling.
+STATS_TTL_SECONDS = 5.0
+DAILY_TTL_SECONDS = 60.0
+HOURLY_TTL_SECONDS = 10.0
+
+# /events/recent responses larger than this are streamed instead of built in memory
+STREAM_EVENTS_ABOVE = 1000
+
+# Keys come from a fixed set of endpoints and validated parameters, so the cache
+# stays small; expired entries are dropped whenever a new one is stored.
+_response_cache = {}
+# One lock per key, so a slow refresh of one endpoint doesn't hold up the others
+_response_cache_locks = {}
+
+
+async def _cached_json(key: tuple, ttl: float, fetch) -> Response:
+    """
+    Return a cached JSON response, refreshing it from the database when expired.
+
+    Args:
+        key: Cache key, e.g. (endpoint, params)
+        ttl: Seconds the serialized payload stays valid
+        fetch: Zero-argument coroutine function producing the payload
+
+    Returns:
+        Response carrying the pre-serialized JSON body
+    """
+    entry = _response_cache.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        async with _response_cache_locks.setdefault(key, asyncio.Lock()):
+            # Another request may have refreshed it while we waited
+            entry = _response_cache.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                body = orjson.dumps(await fetch())
+                now = time.monotonic()
+                for stale in [k for k, (expiry, _) in _response_cache.items() if expiry <= now]:
+                    del _response_cache[stale]
+                entry = (now + ttl, body)
+                _response_cache[key] = entry
+
+    return Response(content=entry[1], media_type="application/json")
 
 
 @app.get("/")
-def root():
+async def root():
     """Root endpoint."""
     return {
         "message": "Habit Exposer API",
@@ -39,41 +103,42 @@ def root():
 
 
 @app.get("/stats")
-def get_stats():
+async def get_stats(db: DatabaseManagerAsync = Depends(get_db)):
     """Get summary statistics."""
-    summary = db.get_statistics_summary()
-    return JSONResponse(content=summary)
+    return await _cached_json(("stats",), STATS_TTL_SECONDS, db.get_statistics_summary)
 
 
 @app.get("/stats/daily")
-def get_daily_stats(days: int = 7):
+async def get_daily_stats(days: int = Query(7, ge=1, le=365),
+                          db: DatabaseManagerAsync = Depends(get_db)):
     """Get daily statistics."""
-    daily = db.get_daily_statistics(days=days)
-    return JSONResponse(content=daily)
+    return await _cached_json(("stats/daily", days), DAILY_TTL_SECONDS,
+                              lambda: db.get_daily_statistics(days=days))
 
 
 @app.get("/stats/hourly")
-def get_hourly_stats():
+async def get_hourly_stats(db: DatabaseManagerAsync = Depends(get_db)):
     """Get hourly statistics for today."""
-    hourly = db.get_hourly_statistics()
-    return JSONResponse(content=hourly)
+    return await _cached_json(("stats/hourly",), HOURLY_TTL_SECONDS, db.get_hourly_statistics)
 
 
 @app.get("/events/recent")
-def get_recent_events(limit: int = 10):
+async def get_recent_events(limit: int = Query(10, ge=1),
+                            db: DatabaseManagerAsync = Depends(get_db)):
     """Get recent events."""
-    events = db.get_recent_events(limit=limit)
-
-    events_data = []
-    for event in events:
-        events_data.append({
-            "event_id": event.event_uuid,
-            "timestamp": event.timestamp.isoformat(),
-            "frame_count": event.frame_count,
-            "screenshot": event.screenshot_path
-        })
-
-    return JSONResponse(content=events_data)
+    if limit <= STREAM_EVENTS_ABOVE:
+        return await db.get_recent_events_raw(limit=limit)
+
+    async def stream():
+        yield b'['
+        first = True
+        async for rows in db.iter_recent_events_raw(limit=limit):
+            for row in rows:
+                yield orjson.dumps(row) if first else b',' + orjson.dumps(row)
+                first = False
+        yield b']'
+
+    return StreamingResponse(stream(), media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -3,11 +3,14 @@ Create comprehensive analytics posts with graphs and trends.
 Think Strava's detailed activity summary with charts.
 """
 
+import asyncio
 import sys
+from dataclasses import dataclass
+from functools import lru_cache, partial
 from pathlib import Path
 from datetime import datetime, date, timedelta
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
-import random
+import numpy as np
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -15,10 +18,68 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 from storage.database import DatabaseManager
 from utils.config import Config
 
+# libjpeg-turbo's SIMD encoder is used when available; PIL is the fallback
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+    _JPEG = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _JPEG = None
+
+# Fixed English labels, indexed by date.weekday() and date.month - 1
+_WEEKDAY_INITIAL = ('M', 'T', 'W', 'T', 'F', 'S', 'S')
+_WEEKDAY_NAME = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+_MONTH_ABBR = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# Scratch surface for text measurement; metrics don't depend on the target image
+_MEASURE_DRAW = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+
+
+@lru_cache(maxsize=1024)
+def _text_size(text: str, font) -> tuple:
+    """
+    Measure rendered text, memoized per (text, font).
+
+    Args:
+        text: Text to measure
+        font: Loaded PIL font (fonts are loaded once, so identity is stable)
+
+    Returns:
+        (width, height) of the text bounding box
+    """
+    bbox = _MEASURE_DRAW.textbbox((0, 0), text, font=font)
+    return bbox[2] - bbox[0], bbox[3] - bbox[1]
+
+
+@dataclass
+class DaysView:
+    """Per-day series for a period, one array per field."""
+    dates: list          # date per day
+    counts: np.ndarray   # phone checks per day
+    minutes: np.ndarray  # minutes on phone per day
+    hourly: np.ndarray   # (days, 24) checks per hour of day
+
+    def __len__(self):
+        """Number of days in the view."""
+        return len(self.dates)
+
+    def day(self, i: int) -> dict:
+        """Return one day's date and count."""
+        return {'date': self.dates[i], 'count': int(self.counts[i])}
+
 
 class AnalyticsPostGenerator:
     """Generate detailed analytics posts with graphs."""
 
+    # Shared across instances; populated on first render
+    _FONTS = None
+    _BACKGROUND = None
+
+    # Calendar heatmap ramp from blue (no checks) to red (busiest day)
+    _HEAT_LUT = np.stack([np.linspace(52, 231, 256),
+                          np.linspace(152, 76, 256),
+                          np.linspace(219, 60, 256)], axis=1).astype(np.uint8)
+
     def __init__(self, output_dir: str = "data/posts"):
         """Initialize generator."""
         self.output_dir = Path(output_dir)
@@ -66,81 +127,81 @@ class AnalyticsPostGenerator:
 
     def _generate_sample_weekly_data(self) -> dict:
         """Generate sample data for weekly view."""
+        rng = np.random.default_rng()
         today = date.today()
-        days = []
-
-        # Generate 7 days of sample data
-        for i in range(6, -1, -1):
-            day = today - timedelta(days=i)
-            # Simulate varying usage (worse on weekdays, better on weekends)
-            is_weekend = day.weekday() >= 5
-            base_count = random.randint(5, 10) if is_weekend else random.randint(15, 25)
-
-            days.append({
-                'date': day,
-                'count': base_count,
-                'minutes': base_count * 0.7,
-                'hourly': {f"{h:02d}": random.randint(0, 3) for h in range(24)}
-            })
+        dates = [today - timedelta(days=i) for i in range(6, -1, -1)]
+
+        # Simulate varying usage (worse on weekdays, better on weekends)
+        is_weekend = np.array([day.weekday() >= 5 for day in dates])
+        counts = np.where(is_weekend, rng.integers(5, 11, 7), rng.integers(15, 26, 7))
+        minutes = counts * 0.7
+        hourly = rng.integers(0, 4, size=(7, 24))
+
+        days = DaysView(dates=dates, counts=counts, minutes=minutes, hourly=hourly)
+
+        total = int(counts.sum())
 
         return {
             'period': 'week',
-            'start_date': days[0]['date'],
-            'end_date': days[-1]['date'],
+            'start_date': dates[0],
+            'end_date': dates[-1],
             'days': days,
-            'total': sum(d['count'] for d in days),
-            'avg_daily': sum(d['count'] for d in days) / 7,
-            'total_minutes': sum(d['minutes'] for d in days),
-            'best_day': min(days, key=lambda x: x['count']),
-            'worst_day': max(days, key=lambda x: x['count']),
-            'improvement': random.randint(-15, 20)  # % change from last week
+            'total': total,
+            'avg_daily': total / 7,
+            'total_minutes': float(minutes.sum()),
+            'best_day': days.day(int(counts.argmin())),
+            'worst_day': days.day(int(counts.argmax())),
+            'improvement': int(rng.integers(-15, 21))  # % change from last week
         }
 
     def _generate_sample_monthly_data(self) -> dict:
         """Generate sample data for monthly view."""
+        rng = np.random.default_rng()
         today = date.today()
-        weeks = []
-
-        # Generate 4 weeks of sample data
-        for week_num in range(4):
-            week_start = today - timedelta(days=(3-week_num)*7 + today.weekday())
-            week_data = []
-
-            for day_num in range(7):
-                day = week_start + timedelta(days=day_num)
-                if day <= today:
-                    # Simulate gradual improvement over the month
-                    base = 25 - (week_num * 3)
-                    count = max(5, random.randint(base-5, base+5))
-                    week_data.append({'date': day, 'count': count})
-
-            weeks.append({
+
+        # 4 weeks x 7 days grid, Monday-aligned; future days are masked out
+        week_starts = [today - timedelta(days=(3-week_num)*7 + today.weekday())
+                       for week_num in range(4)]
+        in_range = np.array([[week_start + timedelta(days=day_num) <= today
+                              for day_num in range(7)] for week_start in week_starts])
+
+        # Simulate gradual improvement over the month
+        base = (25 - np.arange(4) * 3)[:, None]
+        counts = np.maximum(5, rng.integers(base - 5, base + 6, size=(4, 7)))
+        totals = np.where(in_range, counts, 0).sum(axis=1)
+
+        weeks = [
+            {
                 'week_num': week_num + 1,
                 'start': week_start,
-                'days': week_data,
-                'total': sum(d['count'] for d in week_data)
-            })
+                'days': [{'date': week_start + timedelta(days=day_num),
+                          'count': int(counts[week_num, day_num])}
+                         for day_num in range(7) if in_range[week_num, day_num]],
+                'total': int(totals[week_num])
+            }
+            for week_num, week_start in enumerate(week_starts)
+        ]
 
-        all_days = [day for week in weeks for day in week['days']]
+        total = int(totals.sum())
 
         return {
             'period': 'month',
             'start_date': weeks[0]['start'],
             'end_date': today,
             'weeks': weeks,
-            'total': sum(d['count'] for d in all_days),
-            'avg_daily': sum(d['count'] for d in all_days) / len(all_days),
-            'best_week': min(weeks, key=lambda x: x['total']),
-            'worst_week': max(weeks, key=lambda x: x['total']),
-            'improvement': random.randint(10, 40),  # % improvement over month
-            'streak': random.randint(3, 7)  # Days under goal
+            'total': total,
+            'avg_daily': total / int(in_range.sum()),
+            'best_week': weeks[int(totals.argmin())],
+            'worst_week': weeks[int(totals.argmax())],
+            'improvement': int(rng.integers(10, 41)),  # % improvement over month
+            'streak': int(rng.integers(3, 8))  # Days under goal
         }
 
     def _render_weekly_post(self, data: dict) -> str:
         """Render weekly analytics post."""
         # Create image (Instagram Story: 1080x1920)
         width, height = 1080, 1920
-        img = Image.new('RGB', (width, height), color=(18, 18, 18))
+        img = self._new_canvas(width, height)
         draw = ImageDraw.Draw(img)
 
         # Load fonts
@@ -161,11 +222,11 @@ class AnalyticsPostGenerator:
 
         # === DAILY BAR CHART ===
         y += 40
-        y = self._draw_bar_chart(draw, width, y, data['days'], fonts)
+        y = self._draw_bar_chart(img, draw, width, y, data['days'], fonts)
 
         # === HEATMAP ===
         y += 40
-        y = self._draw_heatmap(draw, width, y, data['days'], fonts)
+        y = self._draw_heatmap(img, draw, width, y, data['days'], fonts)
 
         # === INSIGHTS ===
         y += 40
@@ -177,7 +238,7 @@ class AnalyticsPostGenerator:
         # Save
         filename = f"analytics_weekly_{date.today().isoformat()}.jpg"
         output_path = self.output_dir / filename
-        img.save(output_path, "JPEG", quality=95)
+        self._save_jpeg(img, output_path)
 
         print(f"✅ Weekly analytics post created: {output_path}")
         return str(output_path)
@@ -185,7 +246,7 @@ class AnalyticsPostGenerator:
     def _render_monthly_post(self, data: dict) -> str:
         """Render monthly analytics post."""
         width, height = 1080, 1920
-        img = Image.new('RGB', (width, height), color=(18, 18, 18))
+        img = self._new_canvas(width, height)
         draw = ImageDraw.Draw(img)
 
         fonts = self._load_fonts()
@@ -209,7 +270,7 @@ class AnalyticsPostGenerator:
 
         # === CALENDAR HEATMAP ===
         y += 40
-        y = self._draw_calendar_heatmap(draw, width, y, data['weeks'], fonts)
+        y = self._draw_calendar_heatmap(img, draw, width, y, data['weeks'], fonts)
 
         # === PROGRESS INDICATOR ===
         y += 40
@@ -224,45 +285,70 @@ class AnalyticsPostGenerator:
 
         filename = f"analytics_monthly_{date.today().isoformat()}.jpg"
         output_path = self.output_dir / filename
-        img.save(output_path, "JPEG", quality=95)
+        self._save_jpeg(img, output_path)
 
         print(f"✅ Monthly analytics post created: {output_path}")
         return str(output_path)
 
-    def _load_fonts(self):
-        """Load fonts with fallback."""
-        try:
-            return {
-                'huge': ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 100),
-                'big': ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60),
-                'medium': ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 42),
-                'small': ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 32),
-                'tiny': ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 24),
-            }
-        except:
-            default = ImageFont.load_default()
-            return {'huge': default, 'big': default, 'medium': default,
-                   'small': default, 'tiny': default}
-
-    def _draw_header(self, draw, width, y, title, start_date, end_date, fonts):
+    @classmethod
+    def _new_canvas(cls, width: int, height: int) -> Image.Image:
+        """Return a fresh copy of the dark post background."""
+        # Read once: the weekly and monthly renders may run this concurrently
+        background = cls._BACKGROUND
+        if background is None or background.size != (width, height):
+            background = Image.fromarray(np.full((height, width, 3), 18, dtype=np.uint8))
+            cls._BACKGROUND = background
+        return background.copy()
+
+    @classmethod
+    def _load_fonts(cls) -> dict:
+        """Load fonts with fallback, parsing the font file once per process."""
+        if cls._FONTS is None:
+            try:
+                cls._FONTS = {
+                    'huge': ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 100),
+                    'big': ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60),
+                    'medium': ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 42),
+                    'small': ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 32),
+                    'tiny': ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 24),
+                }
+            except:
+                default = ImageFont.load_default()
+                cls._FONTS = {'huge': default, 'big': default, 'medium': default,
+                              'small': default, 'tiny': default}
+        return cls._FONTS
+
+    def _save_jpeg(self, img: Image.Image, output_path: Path) -> None:
+        """Encode the rendered post as JPEG, preferring libjpeg-turbo."""
+        if _JPEG is None:
+            img.save(output_path, "JPEG", quality=95)
+            return
+
+        data = _JPEG.encode(np.asarray(img), quality=95,
+                            pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420)
+        with open(output_path, 'wb') as f:
+            f.write(data)
+
+    def _draw_header(self, draw: ImageDraw.ImageDraw, width: int, y: int, title: str,
+                     start_date: date, end_date: date, fonts: dict) -> int:
         """Draw header section."""
         # Title
-        bbox = draw.textbbox((0, 0), title, font=fonts['big'])
-        title_width = bbox[2] - bbox[0]
+        title_width, _ = _text_size(title, fonts['big'])
         draw.text(((width - title_width) // 2, y), title,
                  fill=(255, 255, 255), font=fonts['big'])
         y += 80
 
         # Date range
-        date_range = f"{start_date.strftime('%b %d')} - {end_date.strftime('%b %d, %Y')}"
-        bbox = draw.textbbox((0, 0), date_range, font=fonts['tiny'])
-        range_width = bbox[2] - bbox[0]
+        date_range = (f"{_MONTH_ABBR[start_date.month - 1]} {start_date.day:02d} - "
+                      f"{_MONTH_ABBR[end_date.month - 1]} {end_date.day:02d}, {end_date.year}")
+        range_width, _ = _text_size(date_range, fonts['tiny'])
         draw.text(((width - range_width) // 2, y), date_range,
                  fill=(150, 150, 150), font=fonts['tiny'])
 
         return y + 60
 
-    def _draw_key_metrics(self, draw, width, y, data, fonts):
+    def _draw_key_metrics(self, draw: ImageDraw.ImageDraw, width: int, y: int, data: dict,
+                          fonts: dict) -> int:
         """Draw key metrics row."""
         metrics = [
             ("TOTAL", str(data['total']), (52, 152, 219)),
@@ -277,14 +363,12 @@ class AnalyticsPostGenerator:
 
         for label, value, color in metrics:
             # Label
-            bbox = draw.textbbox((0, 0), label, font=fonts['tiny'])
-            label_w = bbox[2] - bbox[0]
+            label_w, _ = _text_size(label, fonts['tiny'])
             draw.text((x + (metric_width - label_w) // 2, y), label,
                      fill=(150, 150, 150), font=fonts['tiny'])
 
             # Value
-            bbox = draw.textbbox((0, 0), value, font=fonts['big'])
-            value_w = bbox[2] - bbox[0]
+            value_w, _ = _text_size(value, fonts['big'])
             draw.text((x + (metric_width - value_w) // 2, y + 40), value,
                      fill=color, font=fonts['big'])
 
@@ -292,7 +376,8 @@ class AnalyticsPostGenerator:
 
         return y + 130
 
-    def _draw_monthly_metrics(self, draw, width, y, data, fonts):
+    def _draw_monthly_metrics(self, draw: ImageDraw.ImageDraw, width: int, y: int, data: dict,
+                              fonts: dict) -> int:
         """Draw monthly key metrics."""
         metrics = [
             ("TOTAL CHECKS", str(data['total']), (52, 152, 219)),
@@ -305,13 +390,11 @@ class AnalyticsPostGenerator:
         x = spacing
 
         for label, value, color in metrics:
-            bbox = draw.textbbox((0, 0), label, font=fonts['tiny'])
-            label_w = bbox[2] - bbox[0]
+            label_w, _ = _text_size(label, fonts['tiny'])
             draw.text((x + (metric_width - label_w) // 2, y), label,
                      fill=(150, 150, 150), font=fonts['tiny'])
 
-            bbox = draw.textbbox((0, 0), value, font=fonts['big'])
-            value_w = bbox[2] - bbox[0]
+            value_w, _ = _text_size(value, fonts['big'])
             draw.text((x + (metric_width - value_w) // 2, y + 40), value,
                      fill=color, font=fonts['big'])
 
@@ -319,7 +402,8 @@ class AnalyticsPostGenerator:
 
         return y + 130
 
-    def _draw_line_chart(self, draw, width, y, days, fonts):
+    def _draw_line_chart(self, draw: ImageDraw.ImageDraw, width: int, y: int, days: DaysView,
+                         fonts: dict) -> int:
         """Draw line chart showing trend."""
         chart_height = 200
         chart_width = width - 120
@@ -330,9 +414,9 @@ class AnalyticsPostGenerator:
         y += 50
 
         # Find min/max for scaling
-        counts = [d['count'] for d in days]
-        min_val = min(counts)
-        max_val = max(counts)
+        counts = days.counts
+        min_val = int(counts.min())
+        max_val = int(counts.max())
         value_range = max_val - min_val if max_val > min_val else 1
 
         # Draw grid lines
@@ -341,35 +425,27 @@ class AnalyticsPostGenerator:
             draw.line([(chart_x, grid_y), (chart_x + chart_width, grid_y)],
                      fill=(40, 40, 40), width=1)
 
-        # Draw line
-        points = []
-        for i, day in enumerate(days):
-            x = chart_x + (chart_width * i // (len(days) - 1))
-            val = (day['count'] - min_val) / value_range
-            point_y = y + chart_height - int(val * chart_height)
-            points.append((x, point_y))
+        # Draw line as one polyline, then the point markers on top
+        xs = chart_x + chart_width * np.arange(len(days)) // (len(days) - 1)
+        ys = y + chart_height - ((counts - min_val) / value_range * chart_height).astype(int)
+        points = list(zip(xs.tolist(), ys.tolist()))
+        draw.line(points, fill=(52, 152, 219), width=3, joint='curve')
 
-            # Draw point
+        for x, point_y in points:
             draw.ellipse([x-5, point_y-5, x+5, point_y+5],
                         fill=(52, 152, 219))
 
-        # Draw connecting lines
-        for i in range(len(points) - 1):
-            draw.line([points[i], points[i+1]],
-                     fill=(52, 152, 219), width=3)
-
         # Day labels
-        for i, day in enumerate(days):
-            x = chart_x + (chart_width * i // (len(days) - 1))
-            label = day['date'].strftime("%a")[0]  # First letter
-            bbox = draw.textbbox((0, 0), label, font=fonts['tiny'])
-            label_w = bbox[2] - bbox[0]
+        for x, day in zip(xs.tolist(), days.dates):
+            label = _WEEKDAY_INITIAL[day.weekday()]
+            label_w, _ = _text_size(label, fonts['tiny'])
             draw.text((x - label_w // 2, y + chart_height + 10), label,
                      fill=(100, 100, 100), font=fonts['tiny'])
 
         return y + chart_height + 50
 
-    def _draw_bar_chart(self, draw, width, y, days, fonts):
+    def _draw_bar_chart(self, img: Image.Image, draw: ImageDraw.ImageDraw, width: int, y: int,
+                        days: DaysView, fonts: dict) -> int:
         """Draw bar chart for daily breakdown."""
         chart_height = 180
         chart_width = width - 120
@@ -380,30 +456,40 @@ class AnalyticsPostGenerator:
                  fill=(150, 150, 150), font=fonts['small'])
         y += 50
 
-        max_val = max(d['count'] for d in days)
+        counts = days.counts
+        max_val = counts.max()
         bar_width = (chart_width - (len(days) - 1) * 10) // len(days)
-
-        for i, day in enumerate(days):
-            x = chart_x + i * (bar_width + 10)
-            bar_height = int((day['count'] / max_val) * chart_height)
-
-            # Bar
-            color = (46, 213, 115) if day['count'] < 15 else (231, 76, 60)
-            draw.rectangle([x, y + chart_height - bar_height,
-                          x + bar_width, y + chart_height],
-                         fill=color)
+        bar_heights = (counts / max_val * chart_height).astype(int)
+
+        # Rasterize all bars into one region, then paste it in a single call
+        step = bar_width + 10
+        cols = np.arange(len(days) * step - 9)
+        bar_idx = cols // step
+        in_bar = cols % step <= bar_width
+        rows = np.arange(chart_height + 1)[:, None]
+        mask = in_bar & (rows >= chart_height - bar_heights[bar_idx])
+
+        colors = np.where((counts < 15)[:, None], (46, 213, 115), (231, 76, 60)).astype(np.uint8)
+        box = (chart_x, y, chart_x + len(cols), y + chart_height + 1)
+        region = np.array(img.crop(box))
+        region[mask] = colors[np.broadcast_to(bar_idx, mask.shape)[mask]]
+        img.paste(Image.fromarray(region), box[:2])
+
+        for i, count in enumerate(counts.tolist()):
+            x = chart_x + i * step
+            bar_height = int(bar_heights[i])
 
             # Value on top
-            val_text = str(day['count'])
-            bbox = draw.textbbox((0, 0), val_text, font=fonts['tiny'])
-            val_w = bbox[2] - bbox[0]
+            val_text = str(count)
+            val_w, _ = _text_size(val_text, fonts['tiny'])
             draw.text((x + (bar_width - val_w) // 2,
                       y + chart_height - bar_height - 25),
                      val_text, fill=(200, 200, 200), font=fonts['tiny'])
 
         return y + chart_height + 20
 
-    def _draw_heatmap(self, draw, width, y, days, fonts):
+    def _draw_heatmap(self, img: Image.Image, draw: ImageDraw.ImageDraw, width: int, y: int,
+                      days: DaysView, fonts: dict) -> int:
         """Draw hourly heatmap."""
         chart_x = 60
         chart_width = width - 120
@@ -414,53 +500,50 @@ class AnalyticsPostGenerator:
         y += 50
 
         # Aggregate hourly data
-        hourly_total = {}
-        for day in days:
-            for hour, count in day['hourly'].items():
-                hourly_total[hour] = hourly_total.get(hour, 0) + count
+        hourly_total = days.hourly.sum(axis=0)
 
-        # Select peak hours (top 6)
-        peak_hours = sorted(hourly_total.items(),
-                           key=lambda x: x[1], reverse=True)[:6]
-        peak_hours.sort(key=lambda x: x[0])  # Sort by hour
+        # Select peak hours (top 6, ties to the earlier hour), then sort by hour
+        peak = np.sort(np.argsort(-hourly_total, kind='stable')[:6])
+        peak_hours = [(f"{h:02d}", int(hourly_total[h])) for h in peak.tolist()]
 
         if not peak_hours:
             return y + 50
 
-        max_count = max(h[1] for h in peak_hours)
+        counts = hourly_total[peak]
+        max_count = counts.max()
         cell_width = chart_width // len(peak_hours)
         cell_height = 60
 
-        for i, (hour, count) in enumerate(peak_hours):
-            x = chart_x + i * cell_width
-            intensity = count / max_count if max_count > 0 else 0
+        # Color based on intensity, computed for all cells at once
+        intensities = counts / max_count if max_count > 0 else np.zeros(len(counts))
+        colors = (np.array([231, 76, 60]) * intensities[:, None]).astype(np.uint8)
 
-            # Color based on intensity
-            r = int(231 * intensity)
-            g = int(76 * intensity)
-            b = int(60 * intensity)
+        cols = np.arange(len(peak_hours) * cell_width)
+        in_cell = cols % cell_width <= cell_width - 5
+        box = (chart_x, y, chart_x + len(cols), y + cell_height + 1)
+        region = np.array(img.crop(box))
+        region[:, in_cell] = colors[cols[in_cell] // cell_width]
+        img.paste(Image.fromarray(region), box[:2])
 
-            # Cell
-            draw.rectangle([x, y, x + cell_width - 5, y + cell_height],
-                         fill=(r, g, b))
+        for i, (hour, count) in enumerate(peak_hours):
+            x = chart_x + i * cell_width
 
             # Hour label
             hour_text = f"{hour}h"
-            bbox = draw.textbbox((0, 0), hour_text, font=fonts['tiny'])
-            text_w = bbox[2] - bbox[0]
+            text_w, _ = _text_size(hour_text, fonts['tiny'])
             draw.text((x + (cell_width - text_w) // 2, y + 15),
                      hour_text, fill=(255, 255, 255), font=fonts['tiny'])
 
             # Count
             count_text = str(count)
-            bbox = draw.textbbox((0, 0), count_text, font=fonts['small'])
-            count_w = bbox[2] - bbox[0]
+            count_w, _ = _text_size(count_text, fonts['small'])
             draw.text((x + (cell_width - count_w) // 2, y + 35),
                      count_text, fill=(255, 255, 255), font=fonts['small'])
 
         return y + cell_height + 20
 
-    def _draw_insights(self, draw, width, y, data, fonts):
+    def _draw_insights(self, draw: ImageDraw.ImageDraw, width: int, y: int, data: dict,
+                       fonts: dict) -> int:
         """Draw insights section."""
         chart_x = 60
 
@@ -474,8 +557,8 @@ class AnalyticsPostGenerator:
         worst = data['worst_day']
 
         insights = [
-            f"🟢 Best day: {best['date'].strftime('%A')} ({best['count']} checks)",
-            f"🔴 Worst day: {worst['date'].strftime('%A')} ({worst['count']} checks)",
+            f"🟢 Best day: {_WEEKDAY_NAME[best['date'].weekday()]} ({best['count']} checks)",
+            f"🔴 Worst day: {_WEEKDAY_NAME[worst['date'].weekday()]} ({worst['count']} checks)",
             f"📊 Total time: {data['total_minutes']:.1f} minutes",
         ]
 
@@ -491,7 +574,8 @@ class AnalyticsPostGenerator:
 
         return y + 20
 
-    def _draw_weekly_progress(self, draw, width, y, weeks, fonts):
+    def _draw_weekly_progress(self, draw: ImageDraw.ImageDraw, width: int, y: int, weeks: list,
+                              fonts: dict) -> int:
         """Draw weekly progress bars."""
         chart_x = 60
         chart_width = width - 120
@@ -524,7 +608,8 @@ class AnalyticsPostGenerator:
 
         return y + 20
 
-    def _draw_calendar_heatmap(self, draw, width, y, weeks, fonts):
+    def _draw_calendar_heatmap(self, img: Image.Image, draw: ImageDraw.ImageDraw, width: int,
+                               y: int, weeks: list, fonts: dict) -> int:
         """Draw calendar-style heatmap."""
         chart_x = 60
 
@@ -532,38 +617,48 @@ class AnalyticsPostGenerator:
                  fill=(150, 150, 150), font=fonts['small'])
         y += 50
 
-        # Get all counts for color scaling
-        all_counts = [d['count'] for week in weeks for d in week['days']]
-        max_count = max(all_counts) if all_counts else 1
-
         cell_size = 50
         cell_spacing = 8
 
         # Day labels
-        days_labels = ['M', 'T', 'W', 'T', 'F', 'S', 'S']
-        for i, label in enumerate(days_labels):
+        for i, label in enumerate(_WEEKDAY_INITIAL):
             draw.text((chart_x + i * (cell_size + cell_spacing), y),
                      label, fill=(100, 100, 100), font=fonts['tiny'])
 
         y += 30
 
+        # Counts as a weeks x weekday grid; days after today are absent
+        counts = np.zeros((len(weeks), 7))
+        present = np.zeros((len(weeks), 7), dtype=bool)
         for week_idx, week in enumerate(weeks):
-            for day_idx, day in enumerate(week['days']):
-                x = chart_x + day_idx * (cell_size + cell_spacing)
-                y_pos = y + week_idx * (cell_size + cell_spacing)
-
-                # Color intensity
-                intensity = day['count'] / max_count
-                r = int(52 + (231 - 52) * intensity)
-                g = int(152 + (76 - 152) * intensity)
-                b = int(219 + (60 - 219) * intensity)
-
-                draw.rectangle([x, y_pos, x + cell_size, y_pos + cell_size],
-                             fill=(r, g, b))
+            n = len(week['days'])
+            counts[week_idx, :n] = [d['count'] for d in week['days']]
+            present[week_idx, :n] = True
+
+        # Absent days are zero, so the grid max is the max over real days
+        max_count = max(counts.max(), 1)
+
+        # Color intensity, quantized to the ramp's 256 entries
+        cell_rgb = self._HEAT_LUT[(counts / max_count * 255).astype(np.uint8)]
+
+        # Expand cells to pixels and paste the whole grid at once
+        step = cell_size + cell_spacing
+        rows = np.arange(len(weeks) * step - cell_spacing + 1)
+        cols = np.arange(7 * step - cell_spacing + 1)
+        week_of = np.broadcast_to((rows // step)[:, None], (len(rows), len(cols)))
+        day_of = np.broadcast_to((cols // step)[None, :], (len(rows), len(cols)))
+        mask = ((rows % step <= cell_size)[:, None] & (cols % step <= cell_size)[None, :]
+                & present[week_of, day_of])
+
+        box = (chart_x, y, chart_x + len(cols), y + len(rows))
+        region = np.array(img.crop(box))
+        region[mask] = cell_rgb[week_of[mask], day_of[mask]]
+        img.paste(Image.fromarray(region), box[:2])
 
         return y + len(weeks) * (cell_size + cell_spacing) + 20
 
-    def _draw_progress_circle(self, draw, width, y, improvement, fonts):
+    def _draw_progress_circle(self, draw: ImageDraw.ImageDraw, width: int, y: int,
+                              improvement: int, fonts: dict) -> int:
         """Draw circular progress indicator."""
         center_x = width // 2
         radius = 100
@@ -586,14 +681,14 @@ class AnalyticsPostGenerator:
 
         # Percentage in center
         pct_text = f"{improvement}%"
-        bbox = draw.textbbox((0, 0), pct_text, font=fonts['huge'])
-        text_w = bbox[2] - bbox[0]
+        text_w, _ = _text_size(pct_text, fonts['huge'])
         draw.text((center_x - text_w // 2, y + radius - 40),
                  pct_text, fill=(255, 255, 255), font=fonts['huge'])
 
         return y + radius * 2 + 30
 
-    def _draw_achievements(self, draw, width, y, data, fonts):
+    def _draw_achievements(self, draw: ImageDraw.ImageDraw, width: int, y: int, data: dict,
+                           fonts: dict) -> int:
         """Draw achievements/streak section."""
         chart_x = 60
 
@@ -614,25 +709,55 @@ class AnalyticsPostGenerator:
 
         return y
 
-    def _draw_footer(self, draw, width, height, fonts):
+    def _draw_footer(self, draw: ImageDraw.ImageDraw, width: int, height: int,
+                     fonts: dict) -> None:
         """Draw footer branding."""
         y = height - 150
 
         # Logo
         logo = "📱 PHONE SHAMER"
-        bbox = draw.textbbox((0, 0), logo, font=fonts['medium'])
-        logo_w = bbox[2] - bbox[0]
+        logo_w, _ = _text_size(logo, fonts['medium'])
         draw.text(((width - logo_w) // 2, y), logo,
                  fill=(255, 255, 255), font=fonts['medium'])
 
         # Tagline
         tagline = "Digital Detox Analytics"
-        bbox = draw.textbbox((0, 0), tagline, font=fonts['tiny'])
-        tag_w = bbox[2] - bbox[0]
+        tag_w, _ = _text_size(tagline, fonts['tiny'])
         draw.text(((width - tag_w) // 2, y + 60), tagline,
                  fill=(100, 100, 100), font=fonts['tiny'])
 
 
+async def create_all_analytics(generator: AnalyticsPostGenerator,
+                               use_sample_data: bool = False) -> list:
+    """
+    Render the weekly and monthly posts concurrently.
+
+    PIL releases the GIL while rasterizing and encoding, so the two renders
+    overlap on separate cores. Each render queries through its own thread's
+    database session (DatabaseManager.session is per thread), which is
+    closed when the render finishes.
+
+    Args:
+        generator: Generator to render with
+        use_sample_data: If True, generates sample data for demo
+
+    Returns:
+        Paths to the weekly and monthly images
+    """
+    def render(create):
+        try:
+            return create(use_sample_data=use_sample_data)
+        finally:
+            if generator.db is not None:
+                generator.db.Session.remove()
+
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        loop.run_in_executor(None, partial(render, generator.create_weekly_analytics)),
+        loop.run_in_executor(None, partial(render, generator.create_monthly_analytics)),
+    )
+
+
 def main():
     """CLI interface."""
     import argparse
@@ -642,7 +767,7 @@ def main():
     )
     parser.add_argument(
         '--period',
-        choices=['week', 'month'],
+        choices=['week', 'month', 'both'],
         default='week',
         help='Time period for analytics'
     )
@@ -656,27 +781,33 @@ def main():
 
     generator = AnalyticsPostGenerator()
 
-    print(f"\n📊 Creating {args.period}ly analytics post...")
-
-    if args.period == 'week':
-        path = generator.create_weekly_analytics(use_sample_data=args.sample_data)
+    if args.period == 'both':
+        print("\n📊 Creating weekly and monthly analytics posts...")
+        paths = asyncio.run(create_all_analytics(generator, use_sample_data=args.sample_data))
+        periods = ['week', 'month']
     else:
-        path = generator.create_monthly_analytics(use_sample_data=args.sample_data)
-
-    if path:
-        print(f"\n🎉 Analytics post ready: {path}")
-        print("📱 Instagram Story format (1080x1920)")
-        print("📊 Includes:")
+        print(f"\n📊 Creating {args.period}ly analytics post...")
         if args.period == 'week':
-            print("   - Trend line chart")
-            print("   - Daily bar chart")
-            print("   - Hourly heatmap")
-            print("   - Key insights")
+            paths = [generator.create_weekly_analytics(use_sample_data=args.sample_data)]
         else:
-            print("   - Weekly progress bars")
-            print("   - Calendar heatmap")
-            print("   - Progress circle")
-            print("   - Achievements")
+            paths = [generator.create_monthly_analytics(use_sample_data=args.sample_data)]
+        periods = [args.period]
+
+    for period, path in zip(periods, paths):
+        if path:
+            print(f"\n🎉 Analytics post ready: {path}")
+            print("📱 Instagram Story format (1080x1920)")
+            print("📊 Includes:")
+            if period == 'week':
+                print("   - Trend line chart")
+                print("   - Daily bar chart")
+                print("   - Hourly heatmap")
+                print("   - Key insights")
+            else:
+                print("   - Weekly progress bars")
+                print("   - Calendar heatmap")
+                print("   - Progress circle")
+                print("   - Achievements")
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 """Create social media posts with stats overlaid on actual screenshots."""
 
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime, date
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
-import random
+from datetime import date
+from types import SimpleNamespace
+from PIL import Image, ImageDraw, ImageFilter, ImageFont, ImageOps
+import numpy as np
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -12,6 +16,108 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 from storage.database import DatabaseManager, Event
 from utils.config import Config
 
+# Numba is optional; without it banners are blended with NumPy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# libjpeg-turbo bindings are optional; without them posts are saved through PIL
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+    _JPEG = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _JPEG = None
+
+
+@lru_cache(maxsize=None)
+def _get_font(path: str, size: int):
+    """Load a TrueType font once per (path, size), falling back to PIL's default."""
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def _draw_centered(draw: ImageDraw.ImageDraw, text: str, y: int, font, width: int,
+                   **kwargs):
+    """Draw text horizontally centered, measuring it by advance width."""
+    x = int(width - font.getlength(text)) // 2
+    draw.text((x, y), text, font=font, **kwargs)
+
+
+@lru_cache(maxsize=64)
+def _outlined_text_masks(text: str, font, radius: int) -> tuple:
+    """
+    Rasterize text once and derive its outline by dilating the glyph mask.
+
+    Args:
+        text: Text to rasterize
+        font: Loaded PIL font
+        radius: Outline thickness in pixels
+
+    Returns:
+        (fill mask, outline mask), both 'L' images padded by radius on each side
+    """
+    _, _, right, bottom = font.getbbox(text)
+    mask = Image.new('L', (right + 2 * radius, bottom + 2 * radius), 0)
+    ImageDraw.Draw(mask).text((radius, radius), text, fill=255, font=font)
+    return mask, mask.filter(ImageFilter.MaxFilter(2 * radius + 1))
+
+
+def _draw_centered_outlined(img: Image.Image, text: str, y: int, font, width: int,
+                            fill: tuple, stroke_width: int, stroke_fill: tuple):
+    """Draw horizontally centered text with an outline, like draw.text's stroke."""
+    mask, outline = _outlined_text_masks(text, font, stroke_width)
+    x = int(width - font.getlength(text)) // 2 - stroke_width
+    img.paste(stroke_fill, (x, y - stroke_width, x + mask.width, y - stroke_width + mask.height),
+              outline)
+    img.paste(fill, (x, y - stroke_width, x + mask.width, y - stroke_width + mask.height), mask)
+
+
+if njit is not None:
+    # Explicit signature: compiled eagerly at import (and cached on disk)
+    # rather than on the first call of a one-shot CLI run
+    @njit('void(uint8[:, :, ::1], int64, int64, int64, int64, int64, int64)', cache=True)
+    def _blend_rows(arr, y0, y1, r, g, b, a):
+        """Blend (r, g, b) at opacity a over rows y0:y1 of an RGB buffer in place."""
+        inv = 255 - a
+        cr = r * a + 128
+        cg = g * a + 128
+        cb = b * a + 128
+        for y in range(y0, y1):
+            for x in range(arr.shape[1]):
+                t = arr[y, x, 0] * inv + cr
+                arr[y, x, 0] = (t + (t >> 8)) >> 8
+                t = arr[y, x, 1] * inv + cg
+                arr[y, x, 1] = (t + (t >> 8)) >> 8
+                t = arr[y, x, 2] * inv + cb
+                arr[y, x, 2] = (t + (t >> 8)) >> 8
+else:
+    _blend_rows = None
+
+
+def _blend_band(arr: np.ndarray, y0: int, y1: int, color: tuple, alpha: int):
+    """
+    Blend a constant color over rows y0:y1 of an RGB array in place.
+
+    Uses the same integer rounding as PIL's masked paste.
+
+    Args:
+        arr: (height, width, 3) uint8 image array
+        y0: First row of the band
+        y1: Row after the last row of the band
+        color: RGB color to blend in
+        alpha: Opacity of the color, 0-255
+    """
+    if _blend_rows is not None and arr.flags.c_contiguous:
+        _blend_rows(arr, y0, y1, *color, alpha)
+        return
+
+    band = arr[y0:y1].astype(np.int32)
+    tmp = band * (255 - alpha) + np.array(color, np.int32) * alpha + 128
+    arr[y0:y1] = (tmp + (tmp >> 8)) >> 8
+
 
 class OverlayPostGenerator:
     """Generate posts with stats overlaid on actual detection screenshots."""
@@ -71,91 +177,103 @@ class OverlayPostGenerator:
         else:
             # Load event by screenshot path
             event = self.db.session.query(Event).filter_by(screenshot_path=screenshot_path).first()
+            if not event:
+                print(f"No event found for screenshot {screenshot_path}")
+                return None
+
+        # Get today's event count for this event
+        event_date = event.timestamp.date()
+        event_number = self.db.count_events_by_date(event_date, until=event.timestamp)
+        total_today = self.db.count_events_by_date(event_date)
+
+        return self._create_overlay_post_for_event(event, event_number, total_today)
+
+    def _create_overlay_post_for_event(self, event: Event, event_number: int, total_today: int) -> str:
+        """
+        Render the overlay post for an already-resolved event.
+
+        Args:
+            event: Event whose screenshot is used
+            event_number: 1-based position of the event within its day
+            total_today: Number of events on the event's day
+
+        Returns:
+            Path to generated image
+        """
+        # Output depends only on the event and the day's total, so a post
+        # that is already on disk can be reused as-is
+        filename = (f"shame_overlay_{event.event_uuid[:8]}_"
+                    f"{event.timestamp.strftime('%Y%m%d_%H%M%S')}_of{total_today}.jpg")
+        output_path = self.output_dir / filename
+        if output_path.exists():
+            print(f"⏭️  Overlay post already exists: {output_path}")
+            return str(output_path)
 
         # Load screenshot
-        img_path = Path(screenshot_path)
+        img_path = Path(event.screenshot_path)
         if not img_path.exists():
             print(f"Screenshot not found: {img_path}")
             return None
 
         img = Image.open(img_path)
 
-        # Get today's event count for this event
-        event_date = event.timestamp.date()
-        events_today = self.db.get_events_by_date(event_date)
-        event_number = len([e for e in events_today if e.timestamp <= event.timestamp])
-        total_today = len(events_today)
+        # Have JPEG sources decode straight to RGB, at a reduced DCT scale when
+        # large; the post is at most 1080px, so a longer side beyond twice that
+        # is wasted decode work
+        scale = min(2160 / max(img.size), 1)
+        img.draft('RGB', (int(img.width * scale), int(img.height * scale)))
 
-        # Convert to RGB if needed
+        # Convert to RGB if the decoder could not
         if img.mode != 'RGB':
             img = img.convert('RGB')
 
-        # Create drawing context
-        draw = ImageDraw.Draw(img)
         width, height = img.size
 
         # Load fonts
-        try:
-            huge_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", int(height * 0.08))
-            big_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", int(height * 0.06))
-            medium_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", int(height * 0.04))
-            small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", int(height * 0.03))
-        except:
-            huge_font = ImageFont.load_default()
-            big_font = ImageFont.load_default()
-            medium_font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
+        huge_font = _get_font("/System/Library/Fonts/Helvetica.ttc", int(height * 0.08))
+        big_font = _get_font("/System/Library/Fonts/Helvetica.ttc", int(height * 0.06))
+        medium_font = _get_font("/System/Library/Fonts/Helvetica.ttc", int(height * 0.04))
+        small_font = _get_font("/System/Library/Fonts/Helvetica.ttc", int(height * 0.03))
+
+        # === BANNERS ===
+        # Semi-transparent red banner at top, black banner at bottom
+        bottom_height = int(height * 0.20)
+        arr = np.array(img)
+        _blend_band(arr, 0, int(height * 0.15), (231, 76, 60), 220)
+        _blend_band(arr, height - bottom_height, height, (0, 0, 0), 200)
+        img = Image.fromarray(arr)
+
+        # Create drawing context
+        draw = ImageDraw.Draw(img)
 
         # === TOP OVERLAY ===
-        # Create semi-transparent red banner at top
-        top_overlay = Image.new('RGBA', (width, int(height * 0.15)), (231, 76, 60, 220))
-        img.paste(top_overlay, (0, 0), top_overlay)
 
         # Main "CAUGHT" message
-        caught_msg = random.choice(self.MESSAGES['caught'])
-        bbox = draw.textbbox((0, 0), caught_msg, font=huge_font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        draw.text(((width - text_width) // 2, int(height * 0.02)), caught_msg,
-                 fill=(255, 255, 255), font=huge_font, stroke_width=3, stroke_fill=(0, 0, 0))
+        caught_msg = self._pick(self.MESSAGES['caught'], event)
+        _draw_centered_outlined(img, caught_msg, int(height * 0.02), huge_font, width,
+                                fill=(255, 255, 255), stroke_width=3, stroke_fill=(0, 0, 0))
 
         # Event number
-        stats_msg = random.choice(self.MESSAGES['stats']).format(count=event_number)
-        bbox = draw.textbbox((0, 0), stats_msg, font=medium_font)
-        text_width = bbox[2] - bbox[0]
-        draw.text(((width - text_width) // 2, int(height * 0.10)), stats_msg,
-                 fill=(255, 255, 255), font=medium_font, stroke_width=2, stroke_fill=(0, 0, 0))
+        stats_msg = self._pick(self.MESSAGES['stats'], event).format(count=event_number)
+        _draw_centered_outlined(img, stats_msg, int(height * 0.10), medium_font, width,
+                                fill=(255, 255, 255), stroke_width=2, stroke_fill=(0, 0, 0))
 
         # === BOTTOM OVERLAY ===
-        # Create semi-transparent black banner at bottom
-        bottom_height = int(height * 0.20)
-        bottom_overlay = Image.new('RGBA', (width, bottom_height), (0, 0, 0, 200))
-        img.paste(bottom_overlay, (0, height - bottom_height), bottom_overlay)
-
+        # Timestamp, daily stats and duration, one line under another
         y_pos = height - bottom_height + 10
-
-        # Timestamp
+        h5 = int(height * 0.05)
         timestamp = event.timestamp.strftime("%B %d, %Y at %I:%M %p")
-        time_text = f"📅 {timestamp}"
-        draw.text((20, y_pos), time_text, fill=(255, 255, 255), font=medium_font)
-        y_pos += int(height * 0.05)
-
-        # Daily stats
-        daily_text = f"📊 Today's Total: {total_today} times"
-        draw.text((20, y_pos), daily_text, fill=(255, 255, 255), font=medium_font)
-        y_pos += int(height * 0.05)
-
-        # Duration
-        duration_text = f"⏱️  Detected for {event.frame_count} frames"
-        draw.text((20, y_pos), duration_text, fill=(255, 255, 255), font=small_font)
-        y_pos += int(height * 0.04)
+        text_ops = (
+            (y_pos, f"📅 {timestamp}", medium_font),
+            (y_pos + h5, f"📊 Today's Total: {total_today} times", medium_font),
+            (y_pos + 2 * h5, f"⏱️  Detected for {event.frame_count} frames", small_font),
+        )
+        for y, text, font in text_ops:
+            draw.text((20, y), text, fill=(255, 255, 255), font=font)
 
         # Watermark
         watermark = "📱 Phone Shamer - Digital Detox Tracker"
-        bbox = draw.textbbox((0, 0), watermark, font=small_font)
-        text_width = bbox[2] - bbox[0]
-        draw.text(((width - text_width) // 2, height - 25), watermark,
-                 fill=(178, 190, 195), font=small_font)
+        _draw_centered(draw, watermark, height - 25, small_font, width, fill=(178, 190, 195))
 
         # === SIDE BADGE (if total today > 10) ===
         if total_today >= 10:
@@ -182,18 +300,17 @@ class OverlayPostGenerator:
         max_size = 1080
         img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
 
-        # Create square canvas with padding if needed
+        # Pad to a centered square if needed
         if img.width != img.height:
-            canvas = Image.new('RGB', (max_size, max_size), (0, 0, 0))
             x_offset = (max_size - img.width) // 2
             y_offset = (max_size - img.height) // 2
-            canvas.paste(img, (x_offset, y_offset))
-            img = canvas
+            img = ImageOps.expand(img, border=(x_offset, y_offset,
+                                               max_size - img.width - x_offset,
+                                               max_size - img.height - y_offset),
+                                  fill=(0, 0, 0))
 
         # Save
-        filename = f"shame_overlay_{event.event_uuid[:8]}_{event.timestamp.strftime('%Y%m%d_%H%M%S')}.png"
-        output_path = self.output_dir / filename
-        img.save(output_path, quality=95)
+        self._save_jpeg(img, output_path)
 
         print(f"✅ Overlay post created: {output_path}")
         print(f"   Event: #{event_number} of {total_today} today")
@@ -201,6 +318,21 @@ class OverlayPostGenerator:
 
         return str(output_path)
 
+    def _pick(self, bucket: list, event: Event) -> str:
+        """Choose a message from bucket, fixed per event by its UUID."""
+        return bucket[int(event.event_uuid.replace('-', '')[:8], 16) % len(bucket)]
+
+    def _save_jpeg(self, img: Image.Image, output_path: Path) -> None:
+        """Encode the rendered post as JPEG, preferring libjpeg-turbo."""
+        if _JPEG is None:
+            img.save(output_path, "JPEG", quality=90, subsampling=2, optimize=False)
+            return
+
+        data = _JPEG.encode(np.asarray(img), quality=90,
+                            pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420)
+        with open(output_path, 'wb') as f:
+            f.write(data)
+
     def create_latest_post(self) -> str:
         """Create post from latest screenshot."""
         return self.create_overlay_post()
@@ -214,19 +346,46 @@ class OverlayPostGenerator:
             print(f"No events found for {today}")
             return []
 
-        paths = []
         print(f"\n📸 Creating posts for {len(events)} events from today...")
 
-        for i, event in enumerate(events, 1):
-            print(f"\n[{i}/{len(events)}] Processing event {event.event_uuid[:8]}...")
-            path = self.create_overlay_post(event_uuid=event.event_uuid)
-            if path:
-                paths.append(path)
+        # Events come newest first, so the Nth of M is event number M - N + 1.
+        # Workers get plain snapshots of the fields rendering needs.
+        total_today = len(events)
+        jobs = [
+            (SimpleNamespace(event_uuid=e.event_uuid, timestamp=e.timestamp,
+                             screenshot_path=e.screenshot_path, frame_count=e.frame_count),
+             total_today - i, total_today)
+            for i, e in enumerate(events)
+        ]
+
+        for i, (event, _, _) in enumerate(jobs, 1):
+            print(f"[{i}/{total_today}] Queued event {event.event_uuid[:8]}")
+
+        # Each post is independent CPU work; FreeType holds the GIL, so use processes
+        workers = min(os.cpu_count() or 1, total_today)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(self.output_dir),)) as pool:
+            paths = [path for path in pool.map(_render_event, jobs) if path]
 
         print(f"\n✅ Created {len(paths)} posts!")
         return paths
 
 
+# Per-process generator used by create_all_today_posts workers
+_worker_generator = None
+
+
+def _init_worker(output_dir: str):
+    """Set up a worker process for batch rendering."""
+    global _worker_generator
+    _worker_generator = OverlayPostGenerator(output_dir)
+
+
+def _render_event(job: tuple) -> str:
+    """Render one (event, event_number, total_today) job in a worker process."""
+    return _worker_generator._create_overlay_post_for_event(*job)
+
+
 def main():
     """CLI interface."""
     import argparse
@@ -251,6 +410,11 @@ def main():
 
     args = parser.parse_args()
 
+    # Validate arguments before paying for config and database setup
+    if args.mode == 'specific' and not (args.screenshot or args.event_id):
+        print("❌ Please provide --screenshot or --event-id")
+        return
+
     generator = OverlayPostGenerator()
 
     if args.mode == 'latest':
@@ -266,11 +430,8 @@ def main():
     elif args.mode == 'specific':
         if args.screenshot:
             path = generator.create_overlay_post(screenshot_path=args.screenshot)
-        elif args.event_id:
-            path = generator.create_overlay_post(event_uuid=args.event_id)
         else:
-            print("❌ Please provide --screenshot or --event-id")
-            return
+            path = generator.create_overlay_post(event_uuid=args.event_id)
 
     print("\n📱 Posts are ready to share on social media!")
     print("💡 Pro tip: The detection boxes make it look more authentic!")
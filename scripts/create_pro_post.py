@@ -4,10 +4,11 @@ Clean, minimal, athletic aesthetic.
 """
 
 import sys
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, date, timedelta
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
-import random
+from PIL import Image, ImageDraw, ImageFont
+import numpy as np
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
@@ -15,10 +16,68 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 from storage.database import DatabaseManager, Event
 from utils.config import Config
 
+# Numba is optional; without it the gradient is built with NumPy broadcasting
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# libjpeg-turbo bindings are optional; without them posts are saved through PIL
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+    _JPEG = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _JPEG = None
+
+
+@lru_cache(maxsize=None)
+def _get_font(path: str, size: int):
+    """Load a TrueType font once per (path, size), falling back to PIL's default."""
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def _draw_centered(draw: ImageDraw.ImageDraw, text: str, y: int, font, width: int,
+                   **kwargs):
+    """Draw text horizontally centered, measuring it by advance width."""
+    x = int(width - font.getlength(text)) // 2
+    draw.text((x, y), text, font=font, **kwargs)
+
+
+if njit is not None:
+    # Explicit signature: compiled eagerly at import (and cached on disk)
+    # rather than on the first call of a one-shot CLI run
+    @njit('void(uint8[:, :, ::1], float32, float32, float32, float32, float32, float32)',
+          cache=True)
+    def _fill_gradient(out, c1r, c1g, c1b, c2r, c2g, c2b):
+        """Fill an (h, w, 3) uint8 buffer with a top-to-bottom gradient."""
+        h, w, _ = out.shape
+        for y in range(h):
+            t = y / h
+            r = np.uint8(c1r * (1 - t) + c2r * t)
+            g = np.uint8(c1g * (1 - t) + c2g * t)
+            b = np.uint8(c1b * (1 - t) + c2b * t)
+            for x in range(w):
+                out[y, x, 0] = r
+                out[y, x, 1] = g
+                out[y, x, 2] = b
+else:
+    _fill_gradient = None
+
 
 class ProPostGenerator:
     """Generate Strava-style professional posts."""
 
+    # Text and shapes that are identical on every post, keyed by (layout, size).
+    # Each entry is (cropped RGBA layer, paste offset), rendered on first use.
+    _STATIC_LAYERS = {}
+
+    # Top of the metrics block in each layout
+    DAILY_METRICS_Y = 400
+    WEEKLY_METRICS_Y = 350
+
     def __init__(self, output_dir: str = "data/posts"):
         """Initialize generator."""
         self.output_dir = Path(output_dir)
@@ -42,38 +101,37 @@ class ProPostGenerator:
         if target_date is None:
             target_date = date.today()
 
-        # Get events for the day
-        events = self.db.get_events_by_date(target_date)
-        event_count = len(events)
+        # Get aggregates for the day
+        summary = self.db.get_day_summary(target_date)
+        event_count = summary['count']
 
         if event_count == 0:
             print(f"No events found for {target_date}")
             return None
 
-        # Get hourly stats
-        hourly_stats = self.db.get_hourly_statistics(target_date)
-
         # Calculate metrics
-        total_frames = sum(e.frame_count for e in events)
-        avg_frames = total_frames / event_count if event_count > 0 else 0
+        total_frames = summary['total_frames']
+        avg_frames = summary['avg_frames']
 
         # Estimate time (assuming ~30 FPS and frame_skip=2)
         estimated_seconds = (total_frames * 2) / 30  # frames * skip / fps
         estimated_minutes = estimated_seconds / 60
 
         # Find peak hour
-        peak_hour = max(hourly_stats.items(), key=lambda x: x[1])[0] if hourly_stats else "N/A"
+        peak_hour = summary['peak_hour'] or "N/A"
 
         # === CREATE IMAGE ===
         width, height = 1080, 1920  # Instagram Story size (9:16)
 
         # Background
-        if use_screenshot and events:
+        if use_screenshot and summary['latest_event']:
             # Use actual screenshot as background
-            screenshot_path = Path(events[0].screenshot_path)
+            screenshot_path = Path(summary['latest_event'].screenshot_path)
             if screenshot_path.exists():
                 bg = Image.open(screenshot_path)
-                bg = bg.convert('RGB')
+                bg.draft('RGB', (width, height))  # Reduced-scale JPEG decode, still covers the story
+                if bg.mode != 'RGB':
+                    bg = bg.convert('RGB')
 
                 # Resize to fill
                 bg_ratio = bg.width / bg.height
@@ -92,115 +150,60 @@ class ProPostGenerator:
                 left = (new_width - width) // 2
                 top = (new_height - height) // 2
                 bg = bg.crop((left, top, left + width, top + height))
+                # Heavy blur for professional look, darkened to 40% while still small
+                bg = self._blur_background(bg, radius=40, brightness=102)
             else:
-                # Fallback gradient
-                bg = self._create_gradient_background(width, height)
+                # Fallback gradient, blurred and darkened the same way
+                bg = self._create_gradient_background(width, height, blur_radius=40, brightness=102)
         else:
             # Create gradient background
-            bg = self._create_gradient_background(width, height)
-
-        # Heavy blur for professional look
-        bg = bg.filter(ImageFilter.GaussianBlur(radius=40))
-
-        # Darken background
-        enhancer = ImageEnhance.Brightness(bg)
-        bg = enhancer.enhance(0.4)  # Darker
+            bg = self._create_gradient_background(width, height, blur_radius=40, brightness=102)
 
         # Create drawing context
         draw = ImageDraw.Draw(bg)
 
         # Load fonts
-        try:
-            huge_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 140)
-            big_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 80)
-            medium_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 50)
-            small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 38)
-            tiny_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 30)
-        except:
-            huge_font = ImageFont.load_default()
-            big_font = ImageFont.load_default()
-            medium_font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
-            tiny_font = ImageFont.load_default()
+        huge_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 140)
+        big_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 80)
+        small_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 38)
+        tiny_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 30)
 
         # === DATE HEADER (top) ===
         date_str = target_date.strftime("%B %d, %Y").upper()
-        bbox = draw.textbbox((0, 0), date_str, font=tiny_font)
-        date_width = bbox[2] - bbox[0]
-        draw.text(((width - date_width) // 2, 100), date_str,
-                 fill=(200, 200, 200), font=tiny_font)
+        _draw_centered(draw, date_str, 100, tiny_font, width, fill=(200, 200, 200))
+
+        # === STATIC LAYOUT (labels, separator, branding) ===
+        self._paste_static_layer(bg, 'daily', self._draw_daily_static)
 
         # === MAIN METRICS (center) ===
-        metrics_y_start = 400
+        metrics_y_start = self.DAILY_METRICS_Y
 
         # Metric 1: Phone Checks
-        self._draw_metric(
-            draw, width, metrics_y_start,
-            "PHONE CHECKS", str(event_count),
-            small_font, huge_font
-        )
+        self._draw_metric_value(draw, width, metrics_y_start,
+                                str(event_count), huge_font)
 
         # Metric 2: Estimated Time
-        self._draw_metric(
-            draw, width, metrics_y_start + 280,
-            "TIME WASTED", f"{estimated_minutes:.1f} min",
-            small_font, big_font
-        )
+        self._draw_metric_value(draw, width, metrics_y_start + 280,
+                                f"{estimated_minutes:.1f} min", big_font)
 
         # Metric 3: Peak Hour
-        self._draw_metric(
-            draw, width, metrics_y_start + 520,
-            "PEAK HOUR", f"{peak_hour}:00",
-            small_font, big_font
-        )
-
-        # === SEPARATOR LINE ===
-        line_y = metrics_y_start + 750
-        draw.line([(width // 2 - 100, line_y), (width // 2 + 100, line_y)],
-                 fill=(255, 255, 255, 128), width=2)
+        self._draw_metric_value(draw, width, metrics_y_start + 520,
+                                f"{peak_hour}:00", big_font)
 
         # === ADDITIONAL STATS (bottom section) ===
-        stats_y = line_y + 60
+        stats_y = metrics_y_start + 750 + 60
 
         # Average frames per detection
         avg_text = f"Avg. duration: {avg_frames:.1f} frames"
-        bbox = draw.textbbox((0, 0), avg_text, font=tiny_font)
-        avg_width = bbox[2] - bbox[0]
-        draw.text(((width - avg_width) // 2, stats_y), avg_text,
-                 fill=(180, 180, 180), font=tiny_font)
+        _draw_centered(draw, avg_text, stats_y, tiny_font, width, fill=(180, 180, 180))
 
         # Longest session
-        longest_event = max(events, key=lambda e: e.frame_count) if events else None
+        longest_event = summary['longest_event']
         if longest_event:
             longest_time = longest_event.timestamp.strftime("%I:%M %p")
             longest_text = f"Longest session: {longest_event.frame_count} frames at {longest_time}"
-            bbox = draw.textbbox((0, 0), longest_text, font=tiny_font)
-            longest_width = bbox[2] - bbox[0]
-            draw.text(((width - longest_width) // 2, stats_y + 50), longest_text,
-                     fill=(180, 180, 180), font=tiny_font)
-
-        # === BRANDING (bottom) ===
-        logo_y = height - 250
-
-        # Phone emoji logo
-        logo_text = "📱"
-        bbox = draw.textbbox((0, 0), logo_text, font=big_font)
-        logo_width = bbox[2] - bbox[0]
-        draw.text(((width - logo_width) // 2, logo_y), logo_text, font=big_font)
-
-        # App name
-        app_name = "PHONE SHAMER"
-        bbox = draw.textbbox((0, 0), app_name, font=medium_font)
-        name_width = bbox[2] - bbox[0]
-        draw.text(((width - name_width) // 2, logo_y + 80), app_name,
-                 fill=(255, 255, 255), font=medium_font)
-
-        # Tagline
-        tagline = "Digital Detox Tracker"
-        bbox = draw.textbbox((0, 0), tagline, font=tiny_font)
-        tagline_width = bbox[2] - bbox[0]
-        draw.text(((width - tagline_width) // 2, logo_y + 150), tagline,
-                 fill=(150, 150, 150), font=tiny_font)
+            _draw_centered(draw, longest_text, stats_y + 50, tiny_font, width,
+                           fill=(180, 180, 180))
 
         # === MOTIVATIONAL MESSAGE ===
         if event_count <= 5:
@@ -213,15 +216,12 @@ class ProPostGenerator:
             message = "Time to disconnect! 🚨"
             color = (231, 76, 60)  # Red
 
-        bbox = draw.textbbox((0, 0), message, font=small_font)
-        msg_width = bbox[2] - bbox[0]
-        draw.text(((width - msg_width) // 2, 300), message,
-                 fill=color, font=small_font)
+        _draw_centered(draw, message, 300, small_font, width, fill=color)
 
         # === Save ===
         filename = f"pro_post_{target_date.isoformat()}.jpg"
         output_path = self.output_dir / filename
-        bg.save(output_path, "JPEG", quality=95)
+        self._save_jpeg(bg, output_path)
 
         print(f"✅ Professional post created: {output_path}")
         print(f"   Phone checks: {event_count}")
@@ -230,40 +230,176 @@ class ProPostGenerator:
 
         return str(output_path)
 
-    def _create_gradient_background(self, width: int, height: int) -> Image:
-        """Create gradient background."""
-        # Create gradient from dark blue to dark purple
-        img = Image.new('RGB', (width, height))
-        draw = ImageDraw.Draw(img)
+    def _save_jpeg(self, img: Image.Image, output_path: Path) -> None:
+        """Encode the rendered post as JPEG, preferring libjpeg-turbo."""
+        if _JPEG is None:
+            img.save(output_path, "JPEG", quality=95, optimize=False, progressive=False)
+            return
+
+        data = _JPEG.encode(np.asarray(img), quality=95,
+                            pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420)
+        with open(output_path, 'wb') as f:
+            f.write(data)
 
+    def _create_gradient_background(self, width: int, height: int, blur_radius: float = 0,
+                                    brightness: int = 256) -> Image:
+        """
+        Create gradient background.
+
+        The gradient only varies down the image, so blurring and darkening
+        are applied to a single column of colors before it is repeated
+        across the width; a 2-D blur over the full canvas gives the same
+        result.
+
+        Args:
+            width: Image width
+            height: Image height
+            blur_radius: Gaussian blur radius (0 for none)
+            brightness: Brightness scale in 1/256ths (256 leaves it unchanged)
+
+        Returns:
+            Gradient image
+        """
         # Gradient colors
-        color1 = (30, 39, 46)    # Dark grey-blue
-        color2 = (72, 52, 212)   # Purple
-
-        for y in range(height):
-            # Interpolate colors
-            ratio = y / height
-            r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-            g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-            b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
-
-        return img
-
-    def _draw_metric(self, draw, width, y_pos, label, value, label_font, value_font):
-        """Draw a metric with label above."""
-        # Label
-        bbox = draw.textbbox((0, 0), label, font=label_font)
-        label_width = bbox[2] - bbox[0]
-        draw.text(((width - label_width) // 2, y_pos), label,
-                 fill=(180, 180, 180), font=label_font)
-
-        # Value
-        bbox = draw.textbbox((0, 0), value, font=value_font)
-        value_width = bbox[2] - bbox[0]
-        draw.text(((width - value_width) // 2, y_pos + 60), value,
-                 fill=(255, 255, 255), font=value_font)
+        color1 = np.array((30, 39, 46))    # Dark grey-blue
+        color2 = np.array((72, 52, 212))   # Purple
+
+        if _fill_gradient is not None and not blur_radius and brightness == 256:
+            out = np.empty((height, width, 3), np.uint8)
+            _fill_gradient(out, *color1.tolist(), *color2.tolist())
+            return Image.fromarray(out, 'RGB')
+
+        # Interpolate one color per row, then repeat it across the width
+        ratio = (np.arange(height) / height)[:, None]
+        rows = (color1 * (1 - ratio) + color2 * ratio).astype(np.uint8)
+
+        if blur_radius:
+            # Edge rows are extended, as in PIL's GaussianBlur
+            reach = int(3 * blur_radius)
+            taps = np.exp(-0.5 * (np.arange(-reach, reach + 1) / blur_radius) ** 2)
+            padded = np.pad(rows.astype(np.float64), ((reach, reach), (0, 0)), mode='edge')
+            rows = np.stack([np.convolve(padded[:, c], taps / taps.sum(), mode='valid')
+                             for c in range(3)], axis=1)
+            rows = np.rint(rows).astype(np.uint16)
+        if brightness != 256:
+            rows = rows.astype(np.uint16) * brightness >> 8
+
+        arr = np.broadcast_to(rows.astype(np.uint8)[:, None, :], (height, width, 3))
+
+        return Image.fromarray(np.ascontiguousarray(arr), 'RGB')
+
+    def _blur_background(self, img: Image.Image, radius: float, factor: int = 8,
+                         brightness: int = 256) -> Image.Image:
+        """
+        Approximate a large Gaussian blur cheaply.
+
+        Blurs a 1/factor downsample with a proportionally smaller radius and
+        scales back up; the result only needs low-frequency content. Any
+        darkening is applied to the small buffer too.
+
+        Args:
+            img: Image to blur
+            radius: Equivalent full-resolution blur radius
+            factor: Downsampling factor
+            brightness: Brightness scale in 1/256ths (256 leaves it unchanged)
+
+        Returns:
+            Blurred image at the original size
+        """
+        from PIL import ImageFilter
+
+        size = img.size
+        small = img.resize((size[0] // factor, size[1] // factor), Image.Resampling.BILINEAR)
+        small = small.filter(ImageFilter.GaussianBlur(radius=radius / factor))
+        if brightness != 256:
+            arr = np.asarray(small).astype(np.uint16) * brightness >> 8
+            small = Image.fromarray(arr.astype(np.uint8))
+        return small.resize(size, Image.Resampling.BILINEAR)
+
+    def _draw_metric_label(self, draw, width, y_pos, label, label_font):
+        """Draw a metric's label."""
+        _draw_centered(draw, label, y_pos, label_font, width, fill=(180, 180, 180))
+
+    def _draw_metric_value(self, draw, width, y_pos, value, value_font):
+        """Draw a metric's value below where its label sits."""
+        _draw_centered(draw, value, y_pos + 60, value_font, width, fill=(255, 255, 255))
+
+    def _paste_static_layer(self, bg: Image.Image, layout: str, draw_static):
+        """
+        Paste a layout's static elements onto a background.
+
+        Args:
+            bg: RGB background to draw on
+            layout: Cache key for the layout, e.g. 'daily'
+            draw_static: Callable(draw, width, height) drawing the static elements
+        """
+        key = (layout, bg.size)
+        if key not in self._STATIC_LAYERS:
+            layer = Image.new('RGBA', bg.size, (0, 0, 0, 0))
+            draw_static(ImageDraw.Draw(layer), *bg.size)
+            box = layer.getbbox()
+            self._STATIC_LAYERS[key] = (layer.crop(box), box[:2])
+
+        layer, offset = self._STATIC_LAYERS[key]
+        bg.paste(layer, offset, layer)
+
+    def _draw_branding(self, draw, width, height, tagline: bool):
+        """Draw the logo and app name, optionally with the tagline."""
+        big_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 80)
+        medium_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 50)
+        tiny_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 30)
+
+        logo_y = height - 250
+
+        # Phone emoji logo
+        logo_text = "📱"
+        _draw_centered(draw, logo_text, logo_y, big_font, width)
+
+        # App name
+        app_name = "PHONE SHAMER"
+        _draw_centered(draw, app_name, logo_y + 80, medium_font, width, fill=(255, 255, 255))
+
+        if tagline:
+            tagline = "Digital Detox Tracker"
+            _draw_centered(draw, tagline, logo_y + 150, tiny_font, width, fill=(150, 150, 150))
+
+    def _draw_daily_static(self, draw, width, height):
+        """Draw the daily post's metric labels, separator and branding."""
+        small_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 38)
+        metrics_y_start = self.DAILY_METRICS_Y
+
+        self._draw_metric_label(draw, width, metrics_y_start, "PHONE CHECKS", small_font)
+        self._draw_metric_label(draw, width, metrics_y_start + 280, "TIME WASTED", small_font)
+        self._draw_metric_label(draw, width, metrics_y_start + 520, "PEAK HOUR", small_font)
+
+        # Separator line
+        line_y = metrics_y_start + 750
+        draw.line([(width // 2 - 100, line_y), (width // 2 + 100, line_y)],
+                 fill=(255, 255, 255), width=2)
+
+        self._draw_branding(draw, width, height, tagline=True)
+
+    def _draw_weekly_static(self, draw, width, height):
+        """Draw the weekly post's header, metric labels, bar track and branding."""
+        medium_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 50)
+        small_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 38)
+        metrics_y = self.WEEKLY_METRICS_Y
+
+        # Header
+        header = "WEEKLY SUMMARY"
+        _draw_centered(draw, header, 100, medium_font, width, fill=(200, 200, 200))
+
+        self._draw_metric_label(draw, width, metrics_y, "TOTAL CHECKS", small_font)
+        self._draw_metric_label(draw, width, metrics_y + 280, "DAILY AVERAGE", small_font)
+
+        # Progress bar track
+        bar_y = metrics_y + 550 + 200
+        bar_width_total = 600
+        bar_x = (width - bar_width_total) // 2
+        draw.rectangle([bar_x, bar_y, bar_x + bar_width_total, bar_y + 40],
+                      fill=(50, 50, 50))
+
+        self._draw_branding(draw, width, height, tagline=False)
 
     def create_weekly_pro_post(self) -> str:
         """Create professional weekly summary post."""
@@ -287,55 +423,33 @@ class ProPostGenerator:
 
         # === CREATE IMAGE ===
         width, height = 1080, 1920
-        bg = self._create_gradient_background(width, height)
-
-        # Blur
-        bg = bg.filter(ImageFilter.GaussianBlur(radius=30))
+        bg = self._create_gradient_background(width, height, blur_radius=30)
 
         draw = ImageDraw.Draw(bg)
 
         # Load fonts
-        try:
-            huge_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 160)
-            big_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 80)
-            medium_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 50)
-            small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 38)
-            tiny_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 30)
-        except:
-            huge_font = ImageFont.load_default()
-            big_font = ImageFont.load_default()
-            medium_font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
-            tiny_font = ImageFont.load_default()
-
-        # === HEADER ===
-        header = "WEEKLY SUMMARY"
-        bbox = draw.textbbox((0, 0), header, font=medium_font)
-        header_width = bbox[2] - bbox[0]
-        draw.text(((width - header_width) // 2, 100), header,
-                 fill=(200, 200, 200), font=medium_font)
+        huge_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 160)
+        big_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 80)
+        small_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 38)
+        tiny_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 30)
+
+        # === STATIC LAYOUT (header, labels, bar track, branding) ===
+        self._paste_static_layer(bg, 'weekly', self._draw_weekly_static)
 
         # Date range
         end_date = today
         start_date = today - timedelta(days=6)
         date_range = f"{start_date.strftime('%b %d')} - {end_date.strftime('%b %d, %Y')}"
-        bbox = draw.textbbox((0, 0), date_range, font=tiny_font)
-        range_width = bbox[2] - bbox[0]
-        draw.text(((width - range_width) // 2, 180), date_range,
-                 fill=(150, 150, 150), font=tiny_font)
+        _draw_centered(draw, date_range, 180, tiny_font, width, fill=(150, 150, 150))
 
         # === METRICS ===
-        metrics_y = 350
+        metrics_y = self.WEEKLY_METRICS_Y
 
         # Total checks
-        self._draw_metric(draw, width, metrics_y,
-                         "TOTAL CHECKS", str(total_week),
-                         small_font, huge_font)
+        self._draw_metric_value(draw, width, metrics_y, str(total_week), huge_font)
 
         # Daily average
-        self._draw_metric(draw, width, metrics_y + 280,
-                         "DAILY AVERAGE", f"{avg_daily:.1f}",
-                         small_font, big_font)
+        self._draw_metric_value(draw, width, metrics_y + 280, f"{avg_daily:.1f}", big_font)
 
         # === BEST/WORST DAYS ===
         comparison_y = metrics_y + 550
@@ -343,18 +457,13 @@ class ProPostGenerator:
         if best_day:
             best_date = datetime.fromisoformat(best_day[0]).strftime("%a")
             best_text = f"Best: {best_date} ({best_day[1]} checks)"
-            bbox = draw.textbbox((0, 0), best_text, font=small_font)
-            best_width = bbox[2] - bbox[0]
-            draw.text(((width - best_width) // 2, comparison_y), best_text,
-                     fill=(46, 213, 115), font=small_font)
+            _draw_centered(draw, best_text, comparison_y, small_font, width, fill=(46, 213, 115))
 
         if worst_day:
             worst_date = datetime.fromisoformat(worst_day[0]).strftime("%a")
             worst_text = f"Worst: {worst_date} ({worst_day[1]} checks)"
-            bbox = draw.textbbox((0, 0), worst_text, font=small_font)
-            worst_width = bbox[2] - bbox[0]
-            draw.text(((width - worst_width) // 2, comparison_y + 70), worst_text,
-                     fill=(231, 76, 60), font=small_font)
+            _draw_centered(draw, worst_text, comparison_y + 70, small_font, width,
+                           fill=(231, 76, 60))
 
         # === PROGRESS BAR ===
         bar_y = comparison_y + 200
@@ -362,10 +471,6 @@ class ProPostGenerator:
         bar_height = 40
         bar_x = (width - bar_width_total) // 2
 
-        # Background bar
-        draw.rectangle([bar_x, bar_y, bar_x + bar_width_total, bar_y + bar_height],
-                      fill=(50, 50, 50))
-
         # Progress (based on improvement from worst to best)
         if worst_day and best_day and worst_day[1] > 0:
             improvement = (worst_day[1] - avg_daily) / worst_day[1]
@@ -375,23 +480,10 @@ class ProPostGenerator:
             draw.rectangle([bar_x, bar_y, bar_x + progress_width, bar_y + bar_height],
                           fill=(46, 213, 115))
 
-        # === BRANDING ===
-        logo_y = height - 250
-        logo_text = "📱"
-        bbox = draw.textbbox((0, 0), logo_text, font=big_font)
-        logo_width = bbox[2] - bbox[0]
-        draw.text(((width - logo_width) // 2, logo_y), logo_text, font=big_font)
-
-        app_name = "PHONE SHAMER"
-        bbox = draw.textbbox((0, 0), app_name, font=medium_font)
-        name_width = bbox[2] - bbox[0]
-        draw.text(((width - name_width) // 2, logo_y + 80), app_name,
-                 fill=(255, 255, 255), font=medium_font)
-
         # === Save ===
         filename = f"pro_weekly_{today.isoformat()}.jpg"
         output_path = self.output_dir / filename
-        bg.save(output_path, "JPEG", quality=95)
+        self._save_jpeg(bg, output_path)
 
         print(f"✅ Professional weekly post created: {output_path}")
         print(f"   Total checks: {total_week}")
@@ -424,13 +516,13 @@ def main():
 
     args = parser.parse_args()
 
-    generator = ProPostGenerator()
-
+    # Validate arguments before paying for config and database setup
     if args.type == 'daily':
         target_date = date.fromisoformat(args.date) if args.date else date.today()
-        path = generator.create_professional_post(target_date, use_screenshot=args.use_screenshot)
+        path = ProPostGenerator().create_professional_post(
+            target_date, use_screenshot=args.use_screenshot)
     else:
-        path = generator.create_weekly_pro_post()
+        path = ProPostGenerator().create_weekly_pro_post()
 
     if path:
         print(f"\n🎉 Professional post ready: {path}")
@@ -1,9 +1,12 @@
 """Generate fun social media posts from phone detection stats."""
 
+import bisect
 import sys
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, date
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
+import numpy as np
 import random
 
 # Add src to path
@@ -13,6 +16,71 @@ from storage.database import DatabaseManager
 from utils.config import Config
 
 
+@lru_cache(maxsize=None)
+def _get_font(path: str, size: int):
+    """Load a TrueType font once per (path, size), falling back to PIL's default."""
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def _draw_centered(draw: ImageDraw.ImageDraw, text: str, y: int, font, width: int,
+                   **kwargs):
+    """Draw text horizontally centered, measuring it by advance width."""
+    x = int(width - font.getlength(text)) // 2
+    draw.text((x, y), text, font=font, **kwargs)
+
+
+@lru_cache(maxsize=128)
+def _text_mask(text: str, font) -> Image.Image:
+    """Rasterize a short chart label once into an 'L' coverage mask."""
+    _, _, right, bottom = font.getbbox(text)
+    mask = Image.new('L', (max(right, 1), max(bottom, 1)), 0)
+    ImageDraw.Draw(mask).text((0, 0), text, fill=255, font=font)
+    return mask
+
+
+def _paste_text(img: Image.Image, xy: tuple, text: str, font, fill: tuple):
+    """Draw a chart label at xy like draw.text, reusing its cached glyph mask."""
+    mask = _text_mask(text, font)
+    img.paste(fill, (int(xy[0]), int(xy[1]), int(xy[0]) + mask.width, int(xy[1]) + mask.height),
+              mask)
+
+
+def _fill_bars(img: Image.Image, x0: int, bottom: int, bar_width: int, step: int,
+               heights: list, color: tuple):
+    """
+    Fill bottom-aligned chart bars with a single paste.
+
+    Bar i covers [x0 + i*step, bottom - heights[i], x0 + i*step + bar_width,
+    bottom], inclusive like draw.rectangle; a negative height skips the bar.
+
+    Args:
+        img: RGB image to draw on
+        x0: Left edge of the first bar
+        bottom: Baseline row shared by all bars
+        bar_width: Bar width in pixels (the rectangle spans bar_width + 1 columns)
+        step: Distance between the left edges of neighbouring bars
+        heights: Bar heights in pixels
+        color: RGB bar color
+    """
+    heights = np.asarray(heights)
+    if heights.size == 0 or heights.max() < 0:
+        return
+
+    cols = np.arange((len(heights) - 1) * step + bar_width + 1)
+    in_bar = cols % step <= bar_width
+    top = bottom - int(heights.max())
+    rows = np.arange(top, bottom + 1)[:, None]
+    mask = in_bar & (rows >= bottom - heights[cols // step])
+
+    box = (x0, top, x0 + len(cols), bottom + 1)
+    region = np.array(img.crop(box))
+    region[mask] = color
+    img.paste(Image.fromarray(region), box[:2])
+
+
 class ShamePostGenerator:
     """Generate shareable social media posts."""
 
@@ -40,6 +108,19 @@ class ShamePostGenerator:
         ]
     }
 
+    # Upper bounds of the low/medium/high categories; anything above is extreme
+    _CAPTION_THRESHOLDS = (3, 10, 20)
+    _CAPTION_POOLS = (CAPTIONS['low'], CAPTIONS['medium'], CAPTIONS['high'], CAPTIONS['extreme'])
+
+    # Background color, title, title font size and title y for each layout
+    _LAYOUTS = {
+        'daily': ((45, 52, 54), "📱 PHONE SHAMER 📱", 80, 80),
+        'weekly': ((30, 39, 46), "📊 WEEKLY SHAME REPORT 📊", 70, 60),
+    }
+
+    # Background with the title already drawn, per layout, built on first use
+    _TEMPLATES = {}
+
     def __init__(self, output_dir: str = "data/posts"):
         """Initialize post generator."""
         self.output_dir = Path(output_dir)
@@ -49,20 +130,28 @@ class ShamePostGenerator:
         self.config = Config.load()
         self.db = DatabaseManager(self.config.storage.database_path)
 
+        # Own caption RNG, so generators in different threads don't share
+        # the random module's global state
+        self._rng = random.Random()
+
     def get_caption(self, count: int) -> str:
         """Get fun caption based on event count."""
-        if count <= 3:
-            category = 'low'
-        elif count <= 10:
-            category = 'medium'
-        elif count <= 20:
-            category = 'high'
-        else:
-            category = 'extreme'
-
-        caption = random.choice(self.CAPTIONS[category])
+        pool = self._CAPTION_POOLS[bisect.bisect_left(self._CAPTION_THRESHOLDS, count)]
+        caption = self._rng.choice(pool)
         return caption.format(count=count)
 
+    @classmethod
+    def _new_canvas(cls, layout: str) -> Image.Image:
+        """Return a fresh 1080x1080 copy of a layout's titled background."""
+        if layout not in cls._TEMPLATES:
+            color, title, size, y = cls._LAYOUTS[layout]
+            template = Image.new('RGB', (1080, 1080), color=color)
+            _draw_centered(ImageDraw.Draw(template), title, y,
+                           _get_font("/System/Library/Fonts/Helvetica.ttc", size), 1080,
+                           fill=(255, 255, 255))
+            cls._TEMPLATES[layout] = template
+        return cls._TEMPLATES[layout].copy()
+
     def create_daily_summary_post(self, target_date: date = None) -> str:
         """
         Create a daily summary post with stats.
@@ -76,50 +165,28 @@ class ShamePostGenerator:
         if target_date is None:
             target_date = date.today()
 
-        # Get events for the day
-        events = self.db.get_events_by_date(target_date)
-        event_count = len(events)
+        # Count and hourly stats for the day, aggregated in SQL
+        event_count, hourly_stats = self.db.get_daily_summary(target_date)
 
         if event_count == 0:
             print(f"No events found for {target_date}")
             return None
 
-        # Get hourly stats for visualization
-        hourly_stats = self.db.get_hourly_statistics(target_date)
-
-        # Create image (Instagram square: 1080x1080)
-        img = Image.new('RGB', (1080, 1080), color=(45, 52, 54))  # Dark background
+        # Create image (Instagram square: 1080x1080), dark background and title
+        img = self._new_canvas('daily')
         draw = ImageDraw.Draw(img)
 
-        # Try to load fonts (fallback to default if not available)
-        try:
-            title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 80)
-            big_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 120)
-            medium_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 50)
-            small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 35)
-        except:
-            # Fallback to default font
-            title_font = ImageFont.load_default()
-            big_font = ImageFont.load_default()
-            medium_font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
-
-        # Title
-        title = "📱 PHONE SHAMER 📱"
-        title_bbox = draw.textbbox((0, 0), title, font=title_font)
-        title_width = title_bbox[2] - title_bbox[0]
-        draw.text(((1080 - title_width) // 2, 80), title, fill=(255, 255, 255), font=title_font)
+        # Load fonts (fallback to default if not available)
+        big_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 120)
+        medium_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 50)
+        small_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 35)
 
         # Date
         date_str = target_date.strftime("%B %d, %Y")
-        date_bbox = draw.textbbox((0, 0), date_str, font=medium_font)
-        date_width = date_bbox[2] - date_bbox[0]
-        draw.text(((1080 - date_width) // 2, 190), date_str, fill=(178, 190, 195), font=medium_font)
+        _draw_centered(draw, date_str, 190, medium_font, 1080, fill=(178, 190, 195))
 
         # Big number in center
         count_str = str(event_count)
-        count_bbox = draw.textbbox((0, 0), count_str, font=big_font)
-        count_width = count_bbox[2] - count_bbox[0]
 
         # Draw circle behind number
         circle_center = (540, 450)
@@ -130,13 +197,11 @@ class ShamePostGenerator:
             fill=(231, 76, 60)  # Red circle
         )
 
-        draw.text(((1080 - count_width) // 2, 400), count_str, fill=(255, 255, 255), font=big_font)
+        _draw_centered(draw, count_str, 400, big_font, 1080, fill=(255, 255, 255))
 
         # "times caught" text
         caught_text = "TIMES CAUGHT!"
-        caught_bbox = draw.textbbox((0, 0), caught_text, font=medium_font)
-        caught_width = caught_bbox[2] - caught_bbox[0]
-        draw.text(((1080 - caught_width) // 2, 540), caught_text, fill=(255, 255, 255), font=medium_font)
+        _draw_centered(draw, caught_text, 540, medium_font, 1080, fill=(255, 255, 255))
 
         # Simple bar chart of hourly activity
         chart_y_start = 700
@@ -153,58 +218,57 @@ class ShamePostGenerator:
         if active_hours:
             draw.text((50, 650), "Peak Hours:", fill=(178, 190, 195), font=small_font)
 
-            for i, (hour, count) in enumerate(active_hours[:10]):  # Show max 10 bars
+            shown_hours = active_hours[:10]  # Show max 10 bars
+
+            # Draw bars
+            _fill_bars(img, chart_x_start, chart_y_start + chart_height, bar_width, bar_spacing,
+                       [int((count / max_events) * chart_height) for _, count in shown_hours],
+                       (52, 152, 219))  # Blue bars
+
+            for i, (hour, count) in enumerate(shown_hours):
                 if count > 0:
-                    bar_height = int((count / max_events) * chart_height)
                     x = chart_x_start + i * bar_spacing
 
-                    # Draw bar
-                    draw.rectangle(
-                        [x, chart_y_start + chart_height - bar_height,
-                         x + bar_width, chart_y_start + chart_height],
-                        fill=(52, 152, 219)  # Blue bars
-                    )
-
                     # Draw hour label
-                    draw.text((x, chart_y_start + chart_height + 10), hour,
-                             fill=(178, 190, 195), font=small_font)
+                    _paste_text(img, (x, chart_y_start + chart_height + 10), hour,
+                                small_font, (178, 190, 195))
 
         # Fun caption at bottom
         caption = self.get_caption(event_count)
-        caption_bbox = draw.textbbox((0, 0), caption, font=medium_font)
-        caption_width = caption_bbox[2] - caption_bbox[0]
+        caption_width = medium_font.getlength(caption)
 
         # Wrap caption if too long
         if caption_width > 1000:
+            # Greedy wrap on word advances measured once, not per candidate line
             words = caption.split()
+            space_width = medium_font.getlength(' ')
             lines = []
             current_line = []
+            line_width = 0
 
             for word in words:
-                current_line.append(word)
-                line_text = ' '.join(current_line)
-                bbox = draw.textbbox((0, 0), line_text, font=medium_font)
-                if bbox[2] - bbox[0] > 1000:
-                    current_line.pop()
+                word_width = medium_font.getlength(word)
+                if current_line and line_width + space_width + word_width > 1000:
                     lines.append(' '.join(current_line))
-                    current_line = [word]
+                    current_line = []
+                    line_width = 0
+                line_width += word_width + (space_width if current_line else 0)
+                current_line.append(word)
 
             if current_line:
                 lines.append(' '.join(current_line))
 
             y = 950
             for line in lines:
-                bbox = draw.textbbox((0, 0), line, font=medium_font)
-                width = bbox[2] - bbox[0]
-                draw.text(((1080 - width) // 2, y), line, fill=(255, 255, 255), font=medium_font)
+                _draw_centered(draw, line, y, medium_font, 1080, fill=(255, 255, 255))
                 y += 55
         else:
-            draw.text(((1080 - caption_width) // 2, 980), caption, fill=(255, 255, 255), font=medium_font)
+            _draw_centered(draw, caption, 980, medium_font, 1080, fill=(255, 255, 255))
 
         # Save image
-        filename = f"shame_post_{target_date.isoformat()}.png"
+        filename = f"shame_post_{target_date.isoformat()}.jpg"
         output_path = self.output_dir / filename
-        img.save(output_path, quality=95)
+        img.save(output_path, "JPEG", quality=92, optimize=False, progressive=False)
 
         print(f"✅ Social media post created: {output_path}")
         return str(output_path)
@@ -241,8 +305,11 @@ class ShamePostGenerator:
         # Create Instagram square canvas
         canvas = Image.new('RGB', (1080, 1080), color=(0, 0, 0))
 
-        # Resize screenshot to fit (keep aspect ratio)
-        screenshot.thumbnail((1080, 800), Image.Resampling.LANCZOS)
+        # Resize screenshot to fit (keep aspect ratio). Camera frames are only
+        # a little larger than the slot, where bilinear is indistinguishable
+        # from Lanczos at a fraction of the cost; thumbnail() still
+        # box-reduces first when the source is much larger
+        screenshot.thumbnail((1080, 800), Image.Resampling.BILINEAR)
 
         # Paste screenshot on canvas (centered)
         x_offset = (1080 - screenshot.width) // 2
@@ -252,33 +319,25 @@ class ShamePostGenerator:
         # Add text overlay at bottom
         draw = ImageDraw.Draw(canvas)
 
-        try:
-            big_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-            small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 40)
-        except:
-            big_font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
+        big_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 60)
+        small_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 40)
 
-        # Black semi-transparent overlay at bottom
-        overlay = Image.new('RGBA', (1080, 200), (0, 0, 0, 200))
-        canvas.paste(overlay, (0, 880), overlay)
+        # Black band at bottom; the screenshot ends above it, so blending a
+        # translucent black over the black canvas would give the same pixels
+        draw.rectangle([0, 880, 1080, 1080], fill=(0, 0, 0))
 
         # Text
         caught_text = "🚨 CAUGHT! 🚨"
-        bbox = draw.textbbox((0, 0), caught_text, font=big_font)
-        width = bbox[2] - bbox[0]
-        draw.text(((1080 - width) // 2, 900), caught_text, fill=(231, 76, 60), font=big_font)
+        _draw_centered(draw, caught_text, 900, big_font, 1080, fill=(231, 76, 60))
 
         timestamp = event.timestamp.strftime("%I:%M %p")
         time_text = f"Busted at {timestamp}"
-        bbox = draw.textbbox((0, 0), time_text, font=small_font)
-        width = bbox[2] - bbox[0]
-        draw.text(((1080 - width) // 2, 990), time_text, fill=(255, 255, 255), font=small_font)
+        _draw_centered(draw, time_text, 990, small_font, 1080, fill=(255, 255, 255))
 
         # Save
-        filename = f"caught_{event.event_uuid[:8]}.png"
+        filename = f"caught_{event.event_uuid[:8]}.jpg"
         output_path = self.output_dir / filename
-        canvas.save(output_path, quality=95)
+        canvas.save(output_path, "JPEG", quality=92, subsampling=2, optimize=False, progressive=False)
 
         print(f"✅ Caught post created: {output_path}")
         return str(output_path)
@@ -295,37 +354,20 @@ class ShamePostGenerator:
             print("No events this week")
             return None
 
-        # Create image
-        img = Image.new('RGB', (1080, 1080), color=(30, 39, 46))
+        # Create image, background and title
+        img = self._new_canvas('weekly')
         draw = ImageDraw.Draw(img)
 
-        try:
-            title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 70)
-            big_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 100)
-            medium_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 45)
-            small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 35)
-        except:
-            title_font = ImageFont.load_default()
-            big_font = ImageFont.load_default()
-            medium_font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
-
-        # Title
-        title = "📊 WEEKLY SHAME REPORT 📊"
-        bbox = draw.textbbox((0, 0), title, font=title_font)
-        width = bbox[2] - bbox[0]
-        draw.text(((1080 - width) // 2, 60), title, fill=(255, 255, 255), font=title_font)
+        big_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 100)
+        medium_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 45)
+        small_font = _get_font("/System/Library/Fonts/Helvetica.ttc", 35)
 
         # Week total
         total_text = str(total_week)
-        bbox = draw.textbbox((0, 0), total_text, font=big_font)
-        width = bbox[2] - bbox[0]
-        draw.text(((1080 - width) // 2, 200), total_text, fill=(231, 76, 60), font=big_font)
+        _draw_centered(draw, total_text, 200, big_font, 1080, fill=(231, 76, 60))
 
         times_text = "times this week!"
-        bbox = draw.textbbox((0, 0), times_text, font=medium_font)
-        width = bbox[2] - bbox[0]
-        draw.text(((1080 - width) // 2, 320), times_text, fill=(255, 255, 255), font=medium_font)
+        _draw_centered(draw, times_text, 320, medium_font, 1080, fill=(255, 255, 255))
 
         # Bar chart
         chart_y = 450
@@ -337,52 +379,47 @@ class ShamePostGenerator:
         max_count = max(daily_stats.values())
 
         dates_sorted = sorted(daily_stats.keys())
+        bar_heights = [int((daily_stats[d] / max_count) * chart_height) if daily_stats[d] > 0 else -1
+                       for d in dates_sorted]
+
+        # Draw bars
+        _fill_bars(img, start_x, chart_y + chart_height, bar_width, bar_spacing, bar_heights,
+                   (52, 152, 219))
+
+        # Day labels and their centering offsets, worked out before the loop
+        day_labels = [datetime.fromisoformat(d).strftime("%a") for d in dates_sorted]
+        day_offsets = [int(bar_width - small_font.getlength(day)) // 2 for day in day_labels]
 
         for i, date_str in enumerate(dates_sorted):
             count = daily_stats[date_str]
 
-            # Draw bar
             if count > 0:
-                bar_height = int((count / max_count) * chart_height)
+                bar_height = bar_heights[i]
                 x = start_x + i * bar_spacing
 
-                draw.rectangle(
-                    [x, chart_y + chart_height - bar_height,
-                     x + bar_width, chart_y + chart_height],
-                    fill=(52, 152, 219)
-                )
-
                 # Count on top of bar
                 count_text = str(count)
-                bbox = draw.textbbox((0, 0), count_text, font=small_font)
-                text_width = bbox[2] - bbox[0]
-                draw.text((x + (bar_width - text_width) // 2,
-                          chart_y + chart_height - bar_height - 40),
-                         count_text, fill=(255, 255, 255), font=small_font)
+                text_width = small_font.getlength(count_text)
+                _paste_text(img, (x + int(bar_width - text_width) // 2,
+                                  chart_y + chart_height - bar_height - 40),
+                            count_text, small_font, (255, 255, 255))
 
                 # Day label
-                day = datetime.fromisoformat(date_str).strftime("%a")
-                bbox = draw.textbbox((0, 0), day, font=small_font)
-                text_width = bbox[2] - bbox[0]
-                draw.text((x + (bar_width - text_width) // 2, chart_y + chart_height + 20),
-                         day, fill=(178, 190, 195), font=small_font)
+                _paste_text(img, (x + day_offsets[i], chart_y + chart_height + 20),
+                            day_labels[i], small_font, (178, 190, 195))
 
         # Bottom message
         avg = total_week / 7
         message = f"Average: {avg:.1f} per day"
-        bbox = draw.textbbox((0, 0), message, font=medium_font)
-        width = bbox[2] - bbox[0]
-        draw.text(((1080 - width) // 2, 900), message, fill=(178, 190, 195), font=medium_font)
+        _draw_centered(draw, message, 900, medium_font, 1080, fill=(178, 190, 195))
 
         judgment = "Not bad!" if avg < 5 else "Yikes! Time to detox! 📵"
-        bbox = draw.textbbox((0, 0), judgment, font=medium_font)
-        width = bbox[2] - bbox[0]
-        draw.text(((1080 - width) // 2, 980), judgment, fill=(255, 255, 255), font=medium_font)
+        _draw_centered(draw, judgment, 980, medium_font, 1080, fill=(255, 255, 255))
 
         # Save
-        filename = f"weekly_report_{today.isoformat()}.png"
+        filename = f"weekly_report_{today.isoformat()}.jpg"
         output_path = self.output_dir / filename
-        img.save(output_path, quality=95)
+        img.save(output_path, "JPEG", quality=92, optimize=False, progressive=False)
 
         print(f"✅ Weekly report created: {output_path}")
         return str(output_path)
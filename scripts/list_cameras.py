@@ -1,11 +1,44 @@
 """Utility script to list all available cameras."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
 
+def _probe(index):
+    """
+    Open one camera index and read its properties.
+
+    Args:
+        index: Camera index to test
+
+    Returns:
+        (index, width, height, fps) if a frame could be grabbed, else None
+    """
+    cap = cv2.VideoCapture(index)
+    try:
+        if not cap.isOpened():
+            return None
+
+        # Grab a frame to confirm it's working; it is never used, so skip
+        # decoding it as read() would
+        if not cap.grab():
+            return None
+
+        # Get camera properties
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = int(cap.get(cv2.CAP_PROP_FPS))
+        return index, width, height, fps
+    finally:
+        cap.release()
+
 def list_cameras(max_test=10):
     """
     Test camera indices from 0 to max_test and list available cameras.
 
+    Indices are probed concurrently, since opening an unused index can
+    block on a backend timeout; results are reported in index order.
+
     Args:
         max_test: Maximum camera index to test
     """
@@ -14,23 +47,18 @@ def list_cameras(max_test=10):
     print("Searching for cameras...")
     print("-" * 50)
 
-    for i in range(max_test):
-        cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            # Try to read a frame to confirm it's working
-            ret, frame = cap.read()
-            if ret:
-                # Get camera properties
-                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                fps = int(cap.get(cv2.CAP_PROP_FPS))
-
-                available_cameras.append(i)
-                print(f"✓ Camera {i}: AVAILABLE")
-                print(f"  Resolution: {width}x{height}")
-                print(f"  FPS: {fps}")
-                print()
-            cap.release()
+    with ThreadPoolExecutor(max_workers=max_test) as pool:
+        results = list(pool.map(_probe, range(max_test)))
+
+    for result in results:
+        if result is None:
+            continue
+        i, width, height, fps = result
+        available_cameras.append(i)
+        print(f"✓ Camera {i}: AVAILABLE")
+        print(f"  Resolution: {width}x{height}")
+        print(f"  FPS: {fps}")
+        print()
 
     print("-" * 50)
     if available_cameras:
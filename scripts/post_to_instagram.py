@@ -5,6 +5,7 @@ NOTHING posts without explicit user confirmation!
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 from PIL import Image
@@ -13,14 +14,10 @@ import time
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-# Try to import instagrapi
-try:
-    from instagrapi import Client
-    from instagrapi.exceptions import LoginRequired
-except ImportError:
-    print("❌ instagrapi not installed!")
-    print("Run: pip install instagrapi")
-    sys.exit(1)
+
+# Largest image Instagram keeps without downscaling, per destination
+STORY_SIZE = (1080, 1920)
+FEED_SIZE = (1080, 1350)
 
 
 class InstagramPoster:
@@ -37,6 +34,8 @@ class InstagramPoster:
 
         self.client = None
         self.session_file = Path("data/.instagram_session.json")
+        self._uploader = None  # Shared by every upload this process makes
+        self.upload_cache_dir = Path("data/.upload_cache")
 
         # Safety check
         if not self.username or not self.password:
@@ -47,31 +46,58 @@ class InstagramPoster:
             sys.exit(1)
 
     def login(self):
-        """Login to Instagram with session management."""
+        """
+        Login to Instagram with session management.
+
+        A saved session is reused as long as Instagram still accepts it, so
+        the password is only sent when there is no session or it expired.
+        """
+        # Imported here so previews and --help don't pay for loading instagrapi
+        try:
+            from instagrapi import Client
+            from instagrapi.exceptions import LoginRequired
+        except ImportError:
+            print("❌ instagrapi not installed!")
+            print("Run: pip install instagrapi")
+            sys.exit(1)
+
         self.client = Client()
+        # Pause between requests so a run doesn't trip rate limits
+        self.client.delay_range = [1, 3]
+        self._enable_keep_alive()
 
         print("🔐 Logging in to Instagram...")
 
         try:
-            # Try to load existing session
             if self.session_file.exists():
                 print("📂 Loading saved session...")
                 self.client.load_settings(self.session_file)
-                self.client.login(self.username, self.password)
-                print("✅ Logged in using saved session!")
+                try:
+                    # Any authenticated call tells us if the session is still valid
+                    self.client.get_timeline_feed()
+                    print("✅ Logged in using saved session!")
+                    return True
+                except LoginRequired:
+                    print("⌛ Saved session expired, logging in again...")
+                    # Keep the device ids so this looks like the same phone
+                    old_settings = self.client.get_settings()
+                    self.client.set_settings({})
+                    self.client.set_uuids(old_settings["uuids"])
+                    self.client.login(self.username, self.password)
             else:
                 # Fresh login
                 print("🆕 Fresh login (this may trigger 2FA)...")
                 self.client.login(self.username, self.password)
 
-                # Save session for next time
-                self.session_file.parent.mkdir(parents=True, exist_ok=True)
-                self.client.dump_settings(self.session_file)
-                print("✅ Logged in and session saved!")
+            # Save session for next time
+            self.session_file.parent.mkdir(parents=True, exist_ok=True)
+            self.client.dump_settings(self.session_file)
+            print("✅ Logged in and session saved!")
 
             return True
 
         except LoginRequired as e:
+            self.client = None  # Don't reuse a client that never authenticated
             print(f"❌ Login failed: {e}")
             print("Possible reasons:")
             print("  - Wrong username/password")
@@ -80,9 +106,85 @@ class InstagramPoster:
             return False
 
         except Exception as e:
+            self.client = None
             print(f"❌ Unexpected error: {e}")
             return False
 
+    def _enable_keep_alive(self):
+        """
+        Pool connections on the client's HTTP sessions.
+
+        Keeps TLS connections open between the upload, configure and other
+        requests of a post, and retries idempotent requests on gateway
+        errors (uploads are POSTs, which urllib3 never retries).
+        """
+        # Both come with instagrapi, which login() has already imported
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        for session in (self.client.private, self.client.public):
+            session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                                  max_retries=retry))
+            session.headers['Connection'] = 'keep-alive'
+
+    def _prepare_upload(self, image_path: Path, max_size) -> Path:
+        """
+        Shrink and JPEG-encode an image for upload, so fewer bytes go over the wire.
+
+        JPEGs that already fit are uploaded as they are. Converted copies are
+        cached by source name, size and modification time, so a retry reuses them.
+
+        Args:
+            image_path: Image to upload
+            max_size: (width, height) the image must fit within
+
+        Returns:
+            Path of the file to upload
+        """
+        with Image.open(image_path) as img:
+            if img.format == 'JPEG' and img.width <= max_size[0] and img.height <= max_size[1]:
+                return image_path
+
+            stat = image_path.stat()
+            cached = self.upload_cache_dir / (
+                f"{image_path.stem}_{stat.st_size}_{stat.st_mtime_ns}_{max_size[0]}x{max_size[1]}.jpg"
+            )
+            if cached.exists():
+                return cached
+
+            img.thumbnail(max_size, Image.LANCZOS)
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            self.upload_cache_dir.mkdir(parents=True, exist_ok=True)
+            img.save(cached, 'JPEG', quality=85, optimize=True, progressive=True)
+        return cached
+
+    def _upload(self, upload, photo_path: Path, caption: str):
+        """
+        Run an upload on a background thread, showing progress until it finishes.
+
+        Args:
+            upload: Client method to call, e.g. self.client.photo_upload
+            photo_path: Image to upload
+            caption: Caption passed through to the upload
+
+        Returns:
+            Whatever the upload returns; its exception is re-raised here
+        """
+        if self._uploader is None:
+            self._uploader = ThreadPoolExecutor(max_workers=1)
+        future = self._uploader.submit(upload, photo_path, caption=caption)
+
+        spinner = "|/-\\"
+        ticks = 0
+        while not future.done():
+            print(f"\r   Uploading {spinner[ticks % len(spinner)]}", end="", flush=True)
+            ticks += 1
+            time.sleep(0.1)
+        print("\r" + " " * 20 + "\r", end="")
+        return future.result()
+
     def preview_post(self, image_path: str, caption: str):
         """Show preview of what will be posted."""
         print("\n" + "="*60)
@@ -186,11 +288,11 @@ class InstagramPoster:
         try:
             print("\n📤 Posting to Instagram Story...")
 
-            # Convert to Path
-            photo_path = Path(image_path)
+            # Resize/re-encode to story dimensions first
+            photo_path = self._prepare_upload(Path(image_path), STORY_SIZE)
 
             # Upload
-            self.client.photo_upload_to_story(photo_path, caption=caption)
+            self._upload(self.client.photo_upload_to_story, photo_path, caption)
 
             print()
             print("✅ SUCCESS! Posted to Instagram Story!")
@@ -251,11 +353,11 @@ class InstagramPoster:
         try:
             print("\n📤 Posting to Instagram Feed...")
 
-            # Convert to Path
-            photo_path = Path(image_path)
+            # Resize/re-encode to feed dimensions first
+            photo_path = self._prepare_upload(Path(image_path), FEED_SIZE)
 
             # Upload
-            self.client.photo_upload(photo_path, caption=caption)
+            self._upload(self.client.photo_upload, photo_path, caption)
 
             print()
             print("✅ SUCCESS! Posted to Instagram Feed!")
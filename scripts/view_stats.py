@@ -1,6 +1,7 @@
 """View statistics from the phone detection database."""
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import date, timedelta
 
@@ -10,6 +11,53 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 from storage.database import DatabaseManager
 from utils.config import Config
 
+# Below this many events the queries are too quick for extra connections to pay off
+PARALLEL_MIN_EVENTS = 10000
+
+
+def _read(db_path, method, **kwargs):
+    """
+    Run one DatabaseManager query on its own read-only connection.
+
+    Args:
+        db_path: Path to SQLite database file
+        method: Name of the DatabaseManager method to call
+        **kwargs: Arguments for that method
+    """
+    db = DatabaseManager(db_path, read_only=True)
+    try:
+        return getattr(db, method)(**kwargs)
+    finally:
+        db.close()
+
+
+def fetch_breakdowns(db, db_path, total_events):
+    """
+    Fetch the daily, hourly and recent-event breakdowns.
+
+    Large databases are queried concurrently, one read-only connection per
+    query; small ones just reuse db.
+
+    Args:
+        db: Open DatabaseManager
+        db_path: Path to SQLite database file
+        total_events: Event count, used to decide whether to parallelize
+
+    Returns:
+        (daily_stats, hourly_stats, recent events)
+    """
+    queries = (
+        ('get_daily_statistics', {'days': 7}),
+        ('get_hourly_statistics', {}),
+        ('get_recent_events', {'limit': 10}),
+    )
+    if total_events < PARALLEL_MIN_EVENTS:
+        return tuple(getattr(db, method)(**kwargs) for method, kwargs in queries)
+
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        futures = [pool.submit(_read, db_path, method, **kwargs) for method, kwargs in queries]
+        return tuple(future.result() for future in futures)
+
 
 def print_statistics():
     """Print comprehensive statistics."""
@@ -24,6 +72,9 @@ def print_statistics():
 
     # Get summary stats
     summary = db.get_statistics_summary()
+    daily_stats, hourly_stats, recent = fetch_breakdowns(
+        db, config.storage.database_path, summary['total_events']
+    )
 
     print("📊 SUMMARY")
     print("-" * 60)
@@ -41,7 +92,6 @@ def print_statistics():
     # Daily stats for last 7 days
     print("📅 DAILY BREAKDOWN (Last 7 Days)")
     print("-" * 60)
-    daily_stats = db.get_daily_statistics(days=7)
     for date_str in sorted(daily_stats.keys(), reverse=True):
         count = daily_stats[date_str]
         bar = "█" * count if count > 0 else ""
@@ -51,7 +101,6 @@ def print_statistics():
     # Hourly stats for today
     print("⏰ HOURLY BREAKDOWN (Today)")
     print("-" * 60)
-    hourly_stats = db.get_hourly_statistics()
 
     # Print in 4 columns
     hours = list(hourly_stats.keys())
@@ -68,7 +117,6 @@ def print_statistics():
     # Recent events
     print("🕐 RECENT EVENTS (Last 10)")
     print("-" * 60)
-    recent = db.get_recent_events(limit=10)
     if recent:
         for event in recent:
             timestamp = event.timestamp.strftime("%Y-%m-%d %H:%M:%S")
@@ -1,3 +1,6 @@
+import threading
+import time
+
 import cv2
 import numpy as np
 
@@ -13,13 +16,58 @@ class CameraManager:
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, resolution[1])
         self.cap.set(cv2.CAP_PROP_FPS, 30)
 
-    def read_frame(self):
-        
-        ret, frame = self.cap.read()
-        if not ret:
-            return None
+        # Newest captured frame not yet handed out, guarded by _frame_ready
+        self._frame_ready = threading.Condition()
+        self._latest = None
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Capture on a background thread so reads overlap with detection."""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+
+    def _capture_loop(self):
+        """Grab and decode frames, keeping only the newest (older ones are dropped)."""
+        while self._running:
+            if not self.cap.grab():
+                time.sleep(0.01)
+                continue
+            # retrieve() decodes into a new array, so frames already handed
+            # out are never overwritten while the caller still holds them
+            ret, frame = self.cap.retrieve()
+            if not ret:
+                continue
+            with self._frame_ready:
+                self._latest = frame
+                self._frame_ready.notify()
+
+    def read_frame(self, timeout=1.0):
+        """
+        Return the newest frame.
+
+        With the capture thread running, waits up to timeout seconds for a
+        frame that has not been returned before; otherwise reads directly.
+        """
+        if self._thread is None:
+            ret, frame = self.cap.read()
+            if not ret:
+                return None
+            return frame
+
+        with self._frame_ready:
+            if self._latest is None:
+                self._frame_ready.wait(timeout)
+            frame, self._latest = self._latest, None
         return frame
 
     def release(self):
         """Release the camera capture."""
-        self.cap.release()
\ No newline at end of file
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.cap.release()
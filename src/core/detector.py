@@ -1,74 +1,211 @@
-from ultralytics import YOLO
+import os
+from pathlib import Path
 import numpy as np
 import cv2
-from typing import Dict, List, Tuple
+from typing import Dict, List
 
 class PhoneDetector:
     # Class constants
     PERSON_CLASS_ID = 0
     PHONE_CLASS_ID = 67
 
-    def __init__(self, model_size='n', confidence=0.5, device='cpu'):
+    # Exported formats the model can run from instead of the PyTorch weights
+    EXPORT_FORMATS = ('onnx', 'openvino')
+
+    def __init__(self, model_size='n', confidence=0.5, device='cpu', backend='pytorch',
+                 precision='fp32'):
         """
         Args:
             model_size: 'n', 's', 'm', 'l', 'x' (nano to extra-large)
             confidence: Detection confidence threshold (0.0-1.0)
             device: 'cpu', 'cuda', or 'mps' (Apple Silicon)
+            backend: 'pytorch', or 'onnx' / 'openvino' to run an exported copy
+                of the weights through ONNX Runtime or OpenVINO
+            precision: 'fp32'; 'fp16' on cuda/mps; or 'int8' with the openvino
+                backend (quantized at export time)
         """
+        # Imported here so importing this module doesn't load PyTorch
+        import torch
+        from ultralytics import YOLO
+
+        if precision == 'int8' and backend != 'openvino':
+            raise ValueError("int8 precision requires the openvino backend")
+
+        weights = f'yolov8{model_size}.pt'
+        if backend in self.EXPORT_FORMATS:
+            weights = self._exported_weights(weights, backend, int8=precision == 'int8')
+        elif backend != 'pytorch':
+            raise ValueError(f"Unknown detection backend: {backend}")
 
-        self.model = YOLO(f'yolov8{model_size}.pt')
+        self.model = YOLO(weights, task='detect')
+        # Half precision only pays off (and is only supported) on a GPU
+        self.half = precision == 'fp16' and device != 'cpu'
         self.confidence = confidence
         self.device = device
+        # Reused by annotate_frame; reallocated only if the frame shape changes
+        self._annot_buf = None
+
+        # Frames are shrunk so their long side matches the model's 640 input
+        self.input_size = 640
+        self._scale_shape = None  # Frame shape the cached resize/scale is for
+        self._small_size = None
+        self._scale = None
+
+        # Built once and passed to every model call
+        self._predict_kwargs = {
+            'conf': confidence,
+            'device': device,
+            'half': self.half,
+            'verbose': False,
+            'save': False,
+            'show': False,
+            'stream': False,
+        }
 
-    def detect(self, frame: np.ndarray) -> Dict[str, List[Dict]]:
+        # Leave half the cores to OpenCV capture/resize and the gesture thread,
+        # and keep OpenCV single-threaded so the two pools don't oversubscribe
+        torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+        cv2.setNumThreads(1)
+
+        # One throwaway pass so kernel setup and graph optimization don't
+        # land on the first real frame
+        self.model(np.zeros((self.input_size, self.input_size, 3), np.uint8),
+                   **self._predict_kwargs)
+
+    def detect(self, frame: np.ndarray) -> Dict[str, Dict[str, np.ndarray]]:
         """
         Detect persons and phones in frame.
-        
+
+        Detections are stored as arrays, one row per object:
+
         Returns:
             {
-                'persons': [{'bbox': [x1,y1,x2,y2], 'confidence': 0.95, 'center': (cx,cy)}, ...],
-                'phones': [{'bbox': [x1,y1,x2,y2], 'confidence': 0.87, 'center': (cx,cy)}, ...]
+                'persons': {'bbox': (K,4) [x1,y1,x2,y2], 'confidence': (K,), 'center': (K,2)},
+                'phones': {'bbox': (M,4) [x1,y1,x2,y2], 'confidence': (M,), 'center': (M,2)}
             }
         """
-        persons = []
-        phones = []
-        results = self.model(frame, conf=self.confidence, device=self.device, verbose=False)
-        for result in results:
-            for box in result.boxes:
-                class_id = int(box.cls[0])
-                bbox = box.xyxy[0].cpu().numpy()
-                confidence = float(box.conf[0])
-                center = self._calculate_center(bbox)
-                if class_id == self.PERSON_CLASS_ID:
-                    persons.append({
-                        'bbox': bbox,
-                        'confidence': confidence,
-                        'center': center}
-                    )
-                elif class_id == self.PHONE_CLASS_ID:
-                    phones.append({
-                        'bbox': bbox,
-                        'confidence': confidence,
-                        'center': center
-                    })
-        return {
-            'persons': persons,
-            'phones': phones
-        }
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames: List[np.ndarray]) -> List[Dict[str, Dict[str, np.ndarray]]]:
+        """
+        Detect persons and phones in several frames with one model call.
+
+        Args:
+            frames: Frames to run through the model as a single batch
+
+        Returns:
+            One detections dict per frame, in the same order and shape as detect()
+        """
+        small_frames = [self._downscale(frame) for frame in frames]
+        results = self.model(small_frames, **self._predict_kwargs)
+        return [self._parse_result(result, self._scale_for(frame))
+                for frame, result in zip(frames, results)]
+
+    def _downscale(self, frame: np.ndarray) -> np.ndarray:
+        """Shrink a frame to the model input size once, with area averaging."""
+        self._scale_for(frame)
+        if self._small_size is None:
+            return frame
+        return cv2.resize(frame, self._small_size, interpolation=cv2.INTER_AREA)
+
+    def _scale_for(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Factors mapping boxes on the downscaled frame back to the original.
+
+        Args:
+            frame: Original frame; the factors are cached per frame shape
+
+        Returns:
+            [sx, sy, sx, sy] to multiply an xyxy box by
+        """
+        if frame.shape != self._scale_shape:
+            height, width = frame.shape[:2]
+            factor = self.input_size / max(width, height)
+            if factor < 1:
+                self._small_size = (round(width * factor), round(height * factor))
+                sx = width / self._small_size[0]
+                sy = height / self._small_size[1]
+            else:
+                self._small_size = None  # Already small enough
+                sx = sy = 1.0
+            self._scale = np.array([sx, sy, sx, sy], dtype=np.float32)
+            self._scale_shape = frame.shape
+        return self._scale
+
+    def _parse_result(self, result, scale: np.ndarray) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Split one frame's YOLO result into person and phone detections.
+
+        Args:
+            result: YOLO result for the downscaled frame
+            scale: Factors from _scale_for() mapping boxes back to frame coordinates
+        """
+        boxes = result.boxes
+        bboxes = boxes.xyxy.cpu().numpy() * scale
+        classes = boxes.cls.cpu().numpy().astype(np.int32)
+        confidences = boxes.conf.cpu().numpy()
+        centers = self._calculate_center(bboxes)
+
+        detections = {}
+        for key, class_id in (('persons', self.PERSON_CLASS_ID), ('phones', self.PHONE_CLASS_ID)):
+            mask = classes == class_id
+            detections[key] = {
+                'bbox': bboxes[mask],
+                'confidence': confidences[mask],
+                'center': centers[mask]
+            }
+        return detections
 
     @staticmethod
-    def _calculate_center(bbox) -> Tuple[float, float]:
-        """Calculate center of bounding box."""
-        x1, y1, x2, y2 = bbox
-        return ((x1 + x2) / 2, (y1 + y2) / 2)
+    def _exported_weights(weights: str, backend: str, int8: bool = False) -> str:
+        """
+        Export PyTorch weights to an inference runtime format, once.
+
+        Args:
+            weights: Path to the .pt weights
+            backend: Export format, one of EXPORT_FORMATS
+            int8: Quantize to int8 while exporting (OpenVINO only)
+
+        Returns:
+            Path to the exported model, reused on later runs
+        """
+        # Exported with a dynamic batch axis, so detect_batch() can run
+        # batch_size > 1; named apart from older fixed-batch exports
+        stem = f'{Path(weights).stem}_dynamic'
+        if backend == 'onnx':
+            exported = Path(f'{stem}.onnx')
+        else:
+            exported = Path(f'{stem}_int8_openvino_model' if int8 else f'{stem}_openvino_model')
+        if exported.exists():
+            return str(exported)
+
+        from ultralytics import YOLO
+
+        options = {'simplify': True} if backend == 'onnx' else {'int8': int8}
+        path = YOLO(weights).export(format=backend, imgsz=640, dynamic=True, **options)
+        return str(Path(path).rename(exported))
+
+    @staticmethod
+    def _calculate_center(bboxes: np.ndarray) -> np.ndarray:
+        """Calculate centers (N,2) of bounding boxes (N,4)."""
+        return (bboxes[:, :2] + bboxes[:, 2:]) / 2
 
     def annotate_frame(self, frame: np.ndarray, detections: Dict) -> np.ndarray:
-        """Draw bounding boxes on frame."""
-        annotated = frame.copy()
-        for person in detections['persons']:
-            cv2.rectangle(annotated, (int(person['bbox'][0]), int(person['bbox'][1])), (int(person['bbox'][2]), int(person['bbox'][3])), (0, 255, 0), 2)
-            cv2.putText(annotated, f"Person {person['confidence']:.2f}", (int(person['bbox'][0]), int(person['bbox'][1])), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-        for phone in detections['phones']:
-            cv2.rectangle(annotated, (int(phone['bbox'][0]), int(phone['bbox'][1])), (int(phone['bbox'][2]), int(phone['bbox'][3])), (0, 0, 255), 2)
-            cv2.putText(annotated, f"Phone {phone['confidence']:.2f}", (int(phone['bbox'][0]), int(phone['bbox'][1])), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 2)
-        return annotated
\ No newline at end of file
+        """
+        Draw bounding boxes on frame.
+
+        The result is drawn into a buffer owned by the detector and is
+        overwritten by the next call; copy it if it has to outlive that.
+        """
+        if self._annot_buf is None or self._annot_buf.shape != frame.shape:
+            self._annot_buf = np.empty_like(frame)
+        np.copyto(self._annot_buf, frame)
+        annotated = self._annot_buf
+        for key, label, color in (('persons', 'Person', (0, 255, 0)),
+                                  ('phones', 'Phone', (0, 0, 255))):
+            group = detections[key]
+            for (x1, y1, x2, y2), confidence in zip(group['bbox'].astype(int).tolist(),
+                                                    group['confidence'].tolist()):
+                cv2.rectangle(annotated, (x1, y1), (x2, y2), color, 2)
+                cv2.putText(annotated, f"{label} {confidence:.2f}", (x1, y1), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+        return annotated
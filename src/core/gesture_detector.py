@@ -1,9 +1,8 @@
 """Gesture detection using MediaPipe's new Gesture Recognizer API."""
 import cv2
+import numpy as np
+import threading
 import time
-import mediapipe as mp
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
 
 
 class GestureDetector:
@@ -16,6 +15,12 @@ class GestureDetector:
         Args:
             model_path: Path to the gesture_recognizer.task model file
         """
+        # Imported here so importing this module doesn't load MediaPipe's runtime
+        import mediapipe as mp
+        from mediapipe.tasks import python
+        from mediapipe.tasks.python import vision
+        self._mp = mp
+
         # Setup options for the recognizer
         base_options = python.BaseOptions(model_asset_path=model_path)
         options = vision.GestureRecognizerOptions(
@@ -23,15 +28,30 @@ class GestureDetector:
             num_hands=1,  # Only track one hand
             min_hand_detection_confidence=0.7,
             min_hand_presence_confidence=0.5,
-            min_tracking_confidence=0.5
+            min_tracking_confidence=0.5,
+            # Recognize asynchronously so inference overlaps with the capture loop
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            result_callback=self._on_result
         )
 
         # Create the gesture recognizer
         self.recognizer = vision.GestureRecognizer.create_from_options(options)
 
-        self.last_gesture_time = 0
+        # Newest recognizer result not yet consumed, written from MediaPipe's thread
+        self._result_lock = threading.Lock()
+        self._latest_result = None
+        self._last_timestamp_ms = -1
+
+        # RGB conversion target, allocated on the first frame
+        self._rgb_buf = None
+
+        self.last_gesture_time = float('-inf')  # time.monotonic() of the last gesture
         self.cooldown_seconds = 1.0  # Wait 1 second between gesture detections
 
+        # Only look at every Nth frame; gestures are held far longer than that
+        self._frame_counter = 0
+        self._stride = 3
+
         print("✅ Gesture Recognizer initialized")
         print("   Recognizes: Open_Palm, Thumbs_Up, Thumbs_Down, Victory, Pointing_Up, Closed_Fist, ILoveYou")
 
@@ -47,19 +67,38 @@ class GestureDetector:
                  "stop" if Closed_Fist detected
                  None if no control gesture detected
         """
+        # Skip frames between strides before doing any image work
+        self._frame_counter += 1
+        if self._frame_counter % self._stride:
+            return None
+
         # Check cooldown
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_gesture_time < self.cooldown_seconds:
+            # Drop results for frames seen before the last gesture fired
+            with self._result_lock:
+                self._latest_result = None
             return None
 
-        # Convert BGR to RGB (MediaPipe uses RGB)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Convert BGR to RGB (MediaPipe uses RGB) into a reused buffer
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+
+        # Create MediaPipe Image (copies the pixels, so the buffer can be reused)
+        mp_image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=self._rgb_buf)
 
-        # Create MediaPipe Image
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        # Queue this frame; LIVE_STREAM needs strictly increasing timestamps
+        timestamp_ms = int(time.monotonic() * 1000)
+        if timestamp_ms > self._last_timestamp_ms:
+            self._last_timestamp_ms = timestamp_ms
+            self.recognizer.recognize_async(mp_image, timestamp_ms)
 
-        # Recognize gestures
-        result = self.recognizer.recognize(mp_image)
+        # Act on the most recent finished result (from an earlier frame)
+        with self._result_lock:
+            result, self._latest_result = self._latest_result, None
+        if result is None:
+            return None
 
         # Check if any hands detected
         if not result.gestures:
@@ -91,6 +130,11 @@ class GestureDetector:
 
         return None
 
+    def _on_result(self, result, output_image, timestamp_ms):
+        """Store the newest result; called by MediaPipe on its own thread."""
+        with self._result_lock:
+            self._latest_result = result
+
     def close(self):
         """Clean up resources."""
         self.recognizer.close()
@@ -0,0 +1,53 @@
+"""Cheap frame differencing to skip detection while the scene is static."""
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Tells whether a frame differs enough from the last one that was detected."""
+
+    def __init__(self, threshold=3.0, size=(80, 45), max_skipped=30):
+        """
+        Args:
+            threshold: Mean absolute grayscale difference (0-255) that counts as motion;
+                0 treats every frame as moving
+            size: (width, height) the frames are shrunk to before comparing
+            max_skipped: Report motion after this many static frames anyway, so
+                slow changes are eventually picked up
+        """
+        self.threshold = threshold
+        self.size = size
+        self.max_skipped = max_skipped
+
+        self._reference = None  # Small grayscale copy of the last frame that moved
+        self._skipped = 0
+
+    def has_motion(self, frame: np.ndarray) -> bool:
+        """
+        Compare frame against the reference.
+
+        When motion is reported the frame becomes the new reference, since the
+        caller is expected to run detection on it.
+
+        Args:
+            frame: Input frame (BGR format from OpenCV)
+
+        Returns:
+            True if the frame should go through detection
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(gray, self.size, interpolation=cv2.INTER_AREA)
+
+        if (self._reference is not None and self._skipped < self.max_skipped
+                and cv2.absdiff(small, self._reference).mean() < self.threshold):
+            self._skipped += 1
+            return False
+
+        self._reference = small
+        self._skipped = 0
+        return True
+
+    def reset(self):
+        """Forget the reference so the next frame counts as motion."""
+        self._reference = None
+        self._skipped = 0
@@ -2,9 +2,11 @@
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, List, Dict
-from collections import deque
+import time
 import uuid
 
+import numpy as np
+
 @dataclass
 class PhoneUsageEvent:
     """Represents a phone usage detection event."""
@@ -19,45 +21,46 @@ class ProximityAnalyzer:
         self.temporal_frames = temporal_frames
         self.cooldown_seconds = cooldown_seconds
 
-        # Track recent detections (True/False)
-        self.detection_history = deque(maxlen=temporal_frames)
+        # Recent detections as bits, newest in bit 0 (1 = overlap seen)
+        self._mask = (1 << temporal_frames) - 1
+        self._history = 0
 
         # Current event tracking
         self.active_event: Optional[PhoneUsageEvent] = None
         self.last_event_time: Optional[datetime] = None
+        # Same instant on the monotonic clock, used for the cooldown
+        self._last_event_mono: Optional[float] = None
 
     def analyze(self, detections: Dict) -> Optional[PhoneUsageEvent]:
         """Analyze if person is using phone (boxes overlap)."""
-        persons = detections['persons']
-        phones = detections['phones']
+        P = detections['persons']['bbox']
+        Q = detections['phones']['bbox']
 
         # No person or phone? Not using phone.
-        if not persons or not phones:
-            self.detection_history.append(False)
+        if len(P) == 0 or len(Q) == 0:
+            self._record(False)
             self._check_event_end()
             return None
 
-        # Check if ANY person overlaps with ANY phone
-        overlap_found = False
-        best_pair = None
+        # Check if ANY person overlaps with ANY phone, all pairs at once
+        mask = ((P[:, None, 0] < Q[None, :, 2]) & (P[:, None, 2] > Q[None, :, 0]) &
+                (P[:, None, 1] < Q[None, :, 3]) & (P[:, None, 3] > Q[None, :, 1]))
 
-        for person in persons:
-            for phone in phones:
-                if self._boxes_overlap(person['bbox'], phone['bbox']):
-                    overlap_found = True
-                    best_pair = (person, phone)
-                    break
-            if overlap_found:
-                break
+        overlap_found = bool(mask.any())
+        best_pair = None
+        if overlap_found:
+            # argwhere is row-major, so this is the first pair in detection order
+            i, j = np.argwhere(mask)[0]
+            best_pair = (P[i], Q[j])
 
         if overlap_found:
-            self.detection_history.append(True)
+            self._record(True)
 
             # Check temporal consistency (5 frames in a row)
             if self._is_temporally_consistent():
                 return self._handle_confirmed_detection(best_pair)
         else:
-            self.detection_history.append(False)
+            self._record(False)
             self._check_event_end()
 
         return None
@@ -65,6 +68,9 @@ class ProximityAnalyzer:
     def _boxes_overlap(self, bbox1, bbox2) -> bool:
         """
         Check if two bounding boxes overlap.
+
+        analyze() applies the same test to every pair at once; this is kept
+        for checking a single pair.
         
         Args:
             bbox1: [x1, y1, x2, y2] - first bounding box
@@ -89,38 +95,35 @@ class ProximityAnalyzer:
         # They overlap only if BOTH X and Y dimensions overlap
         return x_overlap and y_overlap
 
+    def _record(self, overlap_found: bool):
+        """Shift one frame's result into the history window."""
+        self._history = ((self._history << 1) | overlap_found) & self._mask
+
     def _is_temporally_consistent(self) -> bool:
         """
         Check if all last N frames had positive detections.
 
         Returns:
-            True if deque is full and all values are True
+            True if each of the last N frames (N = temporal_frames) detected overlap
         """
-        # Check if we have enough frames
-        if len(self.detection_history) < self.temporal_frames:
-            return False
-
-        # Check if ALL recent frames detected overlap
-        return all(self.detection_history)
+        return self._history == self._mask
 
     def _handle_confirmed_detection(self, pair) -> Optional[PhoneUsageEvent]:
-        """Create or update event."""
-        person, phone = pair
-        current_time = datetime.now()
+        """Create or update event from a (person bbox, phone bbox) pair."""
+        person_bbox, phone_bbox = pair
 
         # Check cooldown
-        if self.last_event_time:
-            time_since_last = (current_time - self.last_event_time).total_seconds()
-            if time_since_last < self.cooldown_seconds:
+        if self._last_event_mono is not None:
+            if time.monotonic() - self._last_event_mono < self.cooldown_seconds:
                 return None  # Still in cooldown
 
         # Create new event if none active
         if self.active_event is None:
             self.active_event = PhoneUsageEvent(
                 event_id=str(uuid.uuid4()),
-                start_time=current_time,
-                person_bbox=person['bbox'].tolist(),
-                phone_bbox=phone['bbox'].tolist(),
+                start_time=datetime.now(),
+                person_bbox=person_bbox.tolist(),
+                phone_bbox=phone_bbox.tolist(),
                 frame_count=1
             )
             return self.active_event  # Return event to trigger screenshot
@@ -131,6 +134,7 @@ class ProximityAnalyzer:
 
     def _check_event_end(self):
         """End active event if detection stopped."""
-        if self.active_event and not any(self.detection_history):
+        if self.active_event and self._history == 0:
             self.last_event_time = datetime.now()
+            self._last_event_mono = time.monotonic()
             self.active_event = None
\ No newline at end of file
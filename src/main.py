@@ -1,8 +1,11 @@
 import cv2
+import importlib.util
 import sys
 import os
 from pathlib import Path
+import queue
 import threading
+import time
 import uvicorn
 
 from core.camera_manager import CameraManager
@@ -13,12 +16,21 @@ from storage.database import DatabaseManager
 from utils.config import Config
 from utils.logger import setup_logger
 from core.gesture_detector import GestureDetector
+from core.motion_gate import MotionGate
+
+API_PATH = Path(__file__).parent.parent / "api.py"
 
 class HabitExposerApp:
     """Main application orchestrator."""
 
     def __init__(self):
         """Initialize all components."""
+        # Everything cleanup() releases starts as None, so it can tell what
+        # was created if initialization fails partway
+        self.has_display = False
+        self.camera_manager = None
+        self.db = None
+        self._writer = None
 
         self.config = Config.load()
         self.logger = setup_logger(self.config)
@@ -35,6 +47,8 @@ class HabitExposerApp:
             model_size=self.config.detection.model_size,
             confidence=self.config.detection.confidence_threshold,
             device=self.config.detection.device,
+            backend=self.config.detection.backend,
+            precision=self.config.detection.precision,
         )
         self.logger.info("Detector initialized")
 
@@ -50,15 +64,25 @@ class HabitExposerApp:
                 self.config.camera.resolution_height,
             ),
         )
+        self.camera_manager.start()
         self.logger.info("Camera manager initialized")
 
         self.screenshot_manager = ScreenshotManager(config=self.config)
         self.logger.info("Screenshot manager initialized")
 
-        self.db = DatabaseManager(self.config.storage.database_path)
+        # Events are committed every few seconds rather than one fsync per burst
+        self.db = DatabaseManager(self.config.storage.database_path, commit_interval=5.0)
         self.logger.info("Database initialized")
 
+        # Pipeline: camera thread -> detection loop -> writer thread. The writer
+        # saves screenshots and commits events so neither stalls detection.
+        # Bounded so a stuck disk can't pile up frames in memory.
+        self._write_q = queue.Queue(maxsize=16)
+        self._writer = threading.Thread(target=self._drain, daemon=True)
+        self._writer.start()
+
         self.gesture_detected = GestureDetector()
+        self.motion_gate = MotionGate(threshold=self.config.detection.motion_threshold)
         self.monitoring_paused = True
 
         # Start API server in background thread
@@ -68,11 +92,12 @@ class HabitExposerApp:
     def _start_api_server(self):
         """Start the FastAPI server in a background thread."""
         try:
-            # Import the FastAPI app
-            api_path = Path(__file__).parent.parent / "api.py"
-            sys.path.insert(0, str(api_path.parent))
-
-            from api import app
+            # Import the FastAPI app straight from its file
+            spec = importlib.util.spec_from_file_location("api", API_PATH)
+            api = importlib.util.module_from_spec(spec)
+            sys.modules["api"] = api
+            spec.loader.exec_module(api)
+            app = api.app
 
             # Run uvicorn in a separate thread
             def run_api():
@@ -92,25 +117,22 @@ class HabitExposerApp:
             self.logger.warning(f"Could not start API server: {e}")
 
     def _check_display(self):
-        """Check if display is available for GUI."""
-        # Check DISPLAY environment variable (Linux/Mac)
-        display_env = os.environ.get('DISPLAY', None)
-        if display_env is None:
-            self.logger.debug("DISPLAY env variable not set - headless mode")
+        """
+        Check if display is available for GUI.
+
+        Only the environment is consulted; probing with a test window costs a
+        display connection at startup. If the first imshow() fails anyway,
+        run() falls back to headless mode.
+        """
+        # DISPLAY (X11) / WAYLAND_DISPLAY on Linux; a terminal session on macOS
+        display_env = (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')
+                       or (sys.platform == 'darwin' and os.environ.get('TERM_PROGRAM')))
+        if not display_env:
+            self.logger.debug("No display env variable set - headless mode")
             return False
 
-        self.logger.debug(f"DISPLAY env found: {display_env}")
-
-        # Try to create a test window
-        try:
-            test_img = cv2.imread('/dev/null')  # Dummy
-            cv2.namedWindow('test', cv2.WINDOW_NORMAL)
-            cv2.destroyWindow('test')
-            self.logger.debug("OpenCV window test passed - GUI available")
-            return True
-        except Exception as e:
-            self.logger.debug(f"OpenCV window test failed: {e} - headless mode")
-            return False
+        self.logger.debug(f"Display env found: {display_env}")
+        return True
 
     def run(self):
         """Run the main detection loop."""
@@ -118,7 +140,14 @@ class HabitExposerApp:
             self.logger.info("Starting detection loop. Press 'q' to quit.")
         else:
             self.logger.info("Starting detection loop. Press Ctrl+C to quit.")
-        frame_count = 0
+        # Detection is paced by time, so it keeps its rate whatever the camera
+        # delivers; frame_skip only sets the default rate
+        target_fps = self.config.detection.target_fps or (
+            self.config.camera.fps_target / self.config.detection.frame_skip)
+        target_interval = 1.0 / target_fps
+        last_detect = float('-inf')
+        pending_frames = []  # Frames waiting for the next batched detection
+        last_detections = None  # Detections for the last frame that moved
 
         while True:
             # Read frame
@@ -127,59 +156,164 @@ class HabitExposerApp:
                 self.logger.warning("Failed to read frame")
                 continue
 
-            # Skip frames for performance (process every Nth frame)
-            frame_count += 1
-            if frame_count % self.config.detection.frame_skip != 0:
+            # Skip frames that arrive before the next detection is due. The
+            # schedule advances by whole intervals rather than from each
+            # frame's (jittery) arrival, so a frame landing just early on the
+            # boundary doesn't push detection back by a whole frame; after a
+            # stall it catches up by at most one detection.
+            now = time.monotonic()
+            if now - last_detect < target_interval:
                 continue
+            last_detect = max(last_detect + target_interval, now - target_interval)
 
               # 1. Check for gestures (change state)
             gesture = self.gesture_detected.detect_control_gesture(frame)
             if gesture == "start":
                 self.monitoring_paused = False
+                self.motion_gate.reset()  # Detections from before the pause are stale
                 self.logger.info("🖐️ Monitoring STARTED!")
             elif gesture == "stop":
                 self.monitoring_paused = True
                 self.logger.info("✊ Monitoring STOPPED!")
 
             if not self.monitoring_paused:
-                 # Detect phones and people
-                detections = self.detector.detect(frame)
-
-                # Draw bounding boxes on frame (always show boxes when monitoring!)
-                display_frame = self.detector.annotate_frame(frame, detections)
-
-                # Add status text (green - active)
-                cv2.putText(display_frame, "MONITORING: ACTIVE", (50, 50),
-                            cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 3)
-
-                # Analyze if phone is being used
-                event = self.proximity_analyzer.analyze(detections)
-
-                # If phone usage detected, save it!
-                if event:
-                    screenshot_path = self.screenshot_manager.save_screenshot(
-                        display_frame, event, detections
-                    )
-                    self.db.add_event(event, screenshot_path)
-                    self.logger.info(f"📱 Phone usage detected! Screenshot: {screenshot_path}")
+                if not pending_frames and not self.motion_gate.has_motion(frame):
+                    # Scene hasn't changed since the last detection: show its
+                    # boxes, but don't feed them to the analyzer again, or one
+                    # spurious detection would count as several frames
+                    batch_ready = False
+                else:
+                    # Collect frames until a full batch is ready for the detector
+                    pending_frames.append(frame)
+                    batch_ready = len(pending_frames) >= self.config.detection.batch_size
+
+                if batch_ready:
+                     # Detect phones and people
+                    batch_detections = self.detector.detect_batch(pending_frames)
+
+                    # Frames are analyzed in capture order, as if detected one by one
+                    for frame, detections in zip(pending_frames, batch_detections):
+                        display_frame = self._handle_detections(frame, detections)
+                    last_detections = batch_detections[-1]
+                    pending_frames.clear()
+                elif self.has_display:
+                    # Gated, or a batch is still filling: show the last boxes so
+                    # the window stays live and 'q' keeps working
+                    display_frame = self._draw_detections(frame, last_detections)
             else:
                 # Monitoring stopped - just show frame with status
-                display_frame = frame.copy()
-                cv2.putText(display_frame, "MONITORING: STOPPED", (50, 50),
-                            cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 255), 3)
+                pending_frames.clear()
+                if self.has_display:
+                    display_frame = frame.copy()
+                    cv2.putText(display_frame, "MONITORING: STOPPED", (50, 50),
+                                cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 255), 3)
 
             # Display the frame (only in GUI mode)
             if self.has_display:
-                cv2.imshow('Habit Exposer', display_frame)
+                try:
+                    cv2.imshow('Habit Exposer', display_frame)
+                except cv2.error as e:
+                    self.logger.warning(f"Could not open window ({e}) - switching to headless mode")
+                    self.has_display = False
+                    continue
                 if cv2.waitKey(1) == ord('q'):
                     break
 
+    def _handle_detections(self, frame, detections):
+        """
+        Analyze a frame's detections, recording an event if they show phone use.
+
+        The frame is only annotated when something will use it: the window,
+        or the screenshot of an event.
+
+        Returns:
+            The annotated frame to display, or None when running headless
+            and no event fired
+        """
+        # Analyze if phone is being used
+        event = self.proximity_analyzer.analyze(detections)
+        if not (self.has_display or event):
+            return None
+
+        display_frame = self._draw_detections(frame, detections)
+
+        # If phone usage detected, save it! (display_frame is the detector's
+        # reused buffer, so the writer gets its own copy)
+        if event:
+            self._write_q.put((display_frame.copy(), event, detections))
+        return display_frame
+
+    def _draw_detections(self, frame, detections):
+        """
+        Annotate frame with detection boxes and the active-monitoring status.
+
+        detections may be None before the first detection; the status is
+        drawn on a copy, since frame may still be waiting in a batch.
+        """
+        # Draw bounding boxes on frame (always show boxes when monitoring!)
+        if detections is None:
+            display_frame = frame.copy()
+        else:
+            display_frame = self.detector.annotate_frame(frame, detections)
+
+        # Add status text (green - active)
+        cv2.putText(display_frame, "MONITORING: ACTIVE", (50, 50),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 3)
+        return display_frame
+
+    def _drain(self, max_batch=50, linger=0.05):
+        """
+        Save screenshots and write events until a None sentinel arrives.
+
+        Blocks for the first event, then briefly waits for more so a burst is
+        committed as one transaction of up to max_batch events.
+        """
+        running = True
+        while running:
+            item = self._write_q.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < max_batch:
+                try:
+                    item = self._write_q.get(timeout=linger)
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+
+            # A failed batch is logged and dropped: if this thread died, the
+            # detection loop would block on the full queue
+            try:
+                saved = []
+                for frame, event, detections in batch:
+                    screenshot_path = self.screenshot_manager.save_screenshot(
+                        frame, event, detections
+                    )
+                    self.logger.info(f"📱 Phone usage detected! Screenshot: {screenshot_path}")
+                    saved.append((event, screenshot_path))
+                if self.db.add_events(saved):
+                    today_count, total_count = self.db.get_cached_counts()
+                    self.logger.info(f"📊 {today_count} events today, {total_count} total")
+            except Exception:
+                self.logger.exception(f"Could not save {len(batch)} events")
+
     def cleanup(self):
         """Clean up resources."""
         self.logger.info("Cleaning up...")
-        if hasattr(self, "camera_manager") and self.camera_manager is not None:
+        if self.camera_manager is not None:
             self.camera_manager.release()
-        if hasattr(self, "db") and self.db is not None:
+        if self._writer is not None and self._writer.is_alive():
+            # Flush events still queued before closing the database
+            try:
+                self._write_q.put(None, timeout=5.0)
+            except queue.Full:
+                self.logger.warning("Writer is stuck - events still queued are dropped")
+            else:
+                self._writer.join(timeout=5.0)
+        if self.db is not None:
             self.db.close()
         # TODO(human): Close gesture detector
         # if hasattr(self, "gesture_detector") and self.gesture_detector is not None:
@@ -0,0 +1,279 @@
+"""Async, pooled read access to the events database for the API server."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+import aiosqlite
+
+from storage.database import DatabaseManager
+
+# Applied once when a pooled connection is opened, then reused across calls.
+# WAL is persistent in the file, so it is set once when create() builds the
+# schema; the pooled connections are read-only and couldn't change it anyway.
+_PRAGMAS = (
+    "PRAGMA query_only=ON",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+)
+
+# Served by the ix_events_recent_cover index without touching the table
+_RECENT_EVENTS_SQL = (
+    "SELECT event_uuid, timestamp, frame_count, screenshot_path FROM events "
+    "ORDER BY timestamp DESC LIMIT ?"
+)
+
+
+def _recent_events(rows) -> list:
+    """Shape rows from _RECENT_EVENTS_SQL for the API response."""
+    parse = datetime.fromisoformat
+    return [
+        {'event_id': r[0], 'timestamp': parse(r[1]), 'frame_count': r[2], 'screenshot': r[3]}
+        for r in rows
+    ]
+
+
+def _day_start(day: date) -> str:
+    """Format the start of a day the way SQLAlchemy stores DateTime columns."""
+    return datetime.combine(day, time.min).isoformat(sep=' ', timespec='microseconds')
+
+
+def _day_end(day: date) -> str:
+    """Format the end of a day the way SQLAlchemy stores DateTime columns."""
+    return datetime.combine(day, time.max).isoformat(sep=' ', timespec='microseconds')
+
+
+class ConnectionPool:
+    """
+    Small pool of reusable read-only aiosqlite connections.
+
+    Connections are opened with mode=ro, so API reads never take the write
+    lock and, under WAL, never block the detector's commits.
+    """
+
+    def __init__(self, db_path: str, min_size: int = 2, max_size: int = 10):
+        """
+        Initialize the pool.
+
+        Args:
+            db_path: Path to SQLite database file
+            min_size: Connections opened eagerly by open()
+            max_size: Upper bound on concurrently open connections
+        """
+        self.db_path = db_path
+        self._uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+        self.min_size = min_size
+        self.max_size = max_size
+        self._idle = asyncio.LifoQueue()
+        self._slots = asyncio.Semaphore(max_size)
+        self._all = []
+
+    async def open(self):
+        """Open the minimum number of connections."""
+        for _ in range(self.min_size):
+            self._idle.put_nowait(await self._connect())
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """Open a new connection and apply per-connection settings."""
+        conn = await aiosqlite.connect(self._uri, uri=True)
+        conn.row_factory = aiosqlite.Row
+        for pragma in _PRAGMAS:
+            await conn.execute(pragma)
+        self._all.append(conn)
+        return conn
+
+    @asynccontextmanager
+    async def connection(self):
+        """Borrow a connection for the duration of the block."""
+        async with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                conn = await self._connect()
+            try:
+                yield conn
+            finally:
+                self._idle.put_nowait(conn)
+
+    async def close(self):
+        """Close every connection opened by the pool, once borrowed ones are returned."""
+        # Holding every slot means no query is still running on a connection
+        for _ in range(self.max_size):
+            await self._slots.acquire()
+        for conn in self._all:
+            await conn.close()
+        self._all.clear()
+
+
+class DatabaseManagerAsync:
+    """Async counterpart of DatabaseManager's read-only statistics queries."""
+
+    def __init__(self, pool: ConnectionPool):
+        """
+        Initialize manager.
+
+        Args:
+            pool: Open connection pool
+        """
+        self.pool = pool
+
+    @classmethod
+    async def create(cls, db_path: str, min_size: int = 2, max_size: int = 10) -> 'DatabaseManagerAsync':
+        """
+        Create the schema if needed and open a connection pool.
+
+        Args:
+            db_path: Path to SQLite database file
+            min_size: Minimum pooled connections
+            max_size: Maximum pooled connections
+
+        Returns:
+            Ready-to-use manager
+        """
+        # DatabaseManager builds the schema from the SQLAlchemy models and
+        # turns on WAL, so the API can start before the detector has run
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, lambda: DatabaseManager(db_path).close())
+
+        pool = ConnectionPool(db_path, min_size=min_size, max_size=max_size)
+        await pool.open()
+        return cls(pool)
+
+    async def get_statistics_summary(self) -> dict:
+        """
+        Get comprehensive statistics summary.
+
+        Returns:
+            Dictionary with various statistics
+        """
+        today = date.today()
+        yesterday = today - timedelta(days=1)
+        week_ago = today - timedelta(days=7)
+
+        async with self.pool.connection() as conn:
+            async with conn.execute(
+                "SELECT "
+                "(SELECT COUNT(*) FROM events WHERE date(timestamp) = ?), "
+                "(SELECT COUNT(*) FROM events WHERE date(timestamp) = ?), "
+                "(SELECT COUNT(*) FROM events WHERE timestamp >= ? AND timestamp <= ?), "
+                "(SELECT COUNT(*) FROM events), "
+                "(SELECT MIN(timestamp) FROM events), "
+                "(SELECT MAX(timestamp) FROM events)",
+                (today.isoformat(), yesterday.isoformat(),
+                 _day_start(week_ago), _day_end(today))
+            ) as cursor:
+                row = await cursor.fetchone()
+
+        today_count, yesterday_count, week_count, total_count, first, last = row
+
+        first_event = datetime.fromisoformat(first) if first else None
+        last_event = datetime.fromisoformat(last) if last else None
+
+        return {
+            'total_events': total_count,
+            'today_events': today_count,
+            'yesterday_events': yesterday_count,
+            'week_events': week_count,
+            'first_event': first_event.isoformat() if first_event else None,
+            'last_event': last_event.isoformat() if last_event else None,
+            'tracking_days': (today - first_event.date()).days + 1 if first_event else 0
+        }
+
+    async def get_daily_statistics(self, days: int = 7) -> dict:
+        """
+        Get daily event counts for the last N days.
+
+        Args:
+            days: Number of days to include
+
+        Returns:
+            Dictionary with date -> count mapping
+        """
+        end_date = date.today()
+        start_date = end_date - timedelta(days=days-1)
+
+        async with self.pool.connection() as conn:
+            async with conn.execute(
+                "SELECT date(timestamp), COUNT(id) FROM events "
+                "WHERE timestamp >= ? GROUP BY date(timestamp)",
+                (_day_start(start_date),)
+            ) as cursor:
+                results = await cursor.fetchall()
+
+        # Create dictionary with all dates (including zeros)
+        stats = {}
+        current_date = start_date
+        while current_date <= end_date:
+            stats[current_date.isoformat()] = 0
+            current_date += timedelta(days=1)
+
+        # Fill in actual counts
+        for day, count in results:
+            stats[day] = count
+
+        return stats
+
+    async def get_hourly_statistics(self, target_date: date = None) -> dict:
+        """
+        Get hourly event distribution for a specific date.
+
+        Args:
+            target_date: Date to analyze. If None, uses today.
+
+        Returns:
+            Dictionary with hour (0-23) -> count mapping
+        """
+        if target_date is None:
+            target_date = date.today()
+
+        async with self.pool.connection() as conn:
+            async with conn.execute(
+                "SELECT strftime('%H', timestamp), COUNT(id) FROM events "
+                "WHERE date(timestamp) = ? GROUP BY strftime('%H', timestamp)",
+                (target_date.isoformat(),)
+            ) as cursor:
+                results = await cursor.fetchall()
+
+        # Create dictionary with all hours (0-23)
+        stats = {f"{h:02d}": 0 for h in range(24)}
+
+        # Fill in actual counts
+        for hour, count in results:
+            stats[hour] = count
+
+        return stats
+
+    async def get_recent_events_raw(self, limit: int = 10) -> list:
+        """
+        Get most recent events already shaped for the API response.
+
+        Args:
+            limit: Maximum number of events to return
+
+        Returns:
+            List of dicts with event_id, timestamp, frame_count, screenshot
+        """
+        async with self.pool.connection() as conn:
+            async with conn.execute(_RECENT_EVENTS_SQL, (limit,)) as cursor:
+                return _recent_events(await cursor.fetchall())
+
+    async def iter_recent_events_raw(self, limit: int = 10, chunk_size: int = 500):
+        """
+        Stream most recent events in API shape, a chunk at a time.
+
+        Args:
+            limit: Maximum number of events to return
+            chunk_size: Rows fetched from the cursor per batch
+
+        Yields:
+            Lists of at most chunk_size dicts shaped like get_recent_events_raw
+        """
+        async with self.pool.connection() as conn:
+            async with conn.execute(_RECENT_EVENTS_SQL, (limit,)) as cursor:
+                while rows := await cursor.fetchmany(chunk_size):
+                    yield _recent_events(rows)
+
+    async def close(self):
+        """Close all pooled connections."""
+        await self.pool.close()
@@ -1,10 +1,12 @@
 """Database manager for event tracking and statistics."""
 
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, func
+from sqlalchemy import create_engine, Column, Index, Integer, String, DateTime, Text, func, text
+from sqlalchemy import event as sa_event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 from datetime import datetime, date, timedelta
-import json
+import orjson
+import threading
 from pathlib import Path
 
 Base = declarative_base()
@@ -22,6 +24,14 @@ class Event(Base):
     phone_bbox = Column(Text)   # Store as JSON string
     frame_count = Column(Integer)
 
+    __table_args__ = (
+        # Covers "most recent events" so it is answered from the index alone
+        Index('ix_events_recent_cover', timestamp.desc(), event_uuid,
+              frame_count, screenshot_path),
+        # Expression index for per-day lookups and per-hour grouping within a day
+        Index('ix_events_day_hour', func.date(timestamp), func.strftime('%H', timestamp)),
+    )
+
     def to_dict(self):
         """Convert event to dictionary."""
         return {
@@ -29,35 +39,205 @@ class Event(Base):
             'event_uuid': self.event_uuid,
             'timestamp': self.timestamp.isoformat() if self.timestamp else None,
             'screenshot_path': self.screenshot_path,
-            'person_bbox': json.loads(self.person_bbox) if self.person_bbox else None,
-            'phone_bbox': json.loads(self.phone_bbox) if self.phone_bbox else None,
+            'person_bbox': orjson.loads(self.person_bbox) if self.person_bbox else None,
+            'phone_bbox': orjson.loads(self.phone_bbox) if self.phone_bbox else None,
             'frame_count': self.frame_count
         }
 
 
+class DailyCount(Base):
+    """Event count per day, kept current by triggers on the events table."""
+    __tablename__ = 'events_daily'
+
+    date = Column(String, primary_key=True)  # YYYY-MM-DD
+    count = Column(Integer, nullable=False)
+
+
+class HourlyCount(Base):
+    """Event count per day and hour, kept current by triggers on the events table."""
+    __tablename__ = 'events_hourly'
+
+    date = Column(String, primary_key=True)  # YYYY-MM-DD
+    hour = Column(String, primary_key=True)  # 00-23
+    count = Column(Integer, nullable=False)
+
+
+# Keep the rollup tables in step with inserts and deletes on events
+_ROLLUP_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS events_rollup_ai AFTER INSERT ON events BEGIN
+        INSERT INTO events_daily (date, count) VALUES (date(NEW.timestamp), 1)
+            ON CONFLICT(date) DO UPDATE SET count = count + 1;
+        INSERT INTO events_hourly (date, hour, count)
+            VALUES (date(NEW.timestamp), strftime('%H', NEW.timestamp), 1)
+            ON CONFLICT(date, hour) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_rollup_ad AFTER DELETE ON events BEGIN
+        UPDATE events_daily SET count = count - 1 WHERE date = date(OLD.timestamp);
+        UPDATE events_hourly SET count = count - 1
+            WHERE date = date(OLD.timestamp) AND hour = strftime('%H', OLD.timestamp);
+    END
+    """,
+)
+
+# Rebuild the rollups from scratch, for databases created before they existed
+_ROLLUP_BACKFILL = (
+    "DELETE FROM events_daily",
+    "DELETE FROM events_hourly",
+    """
+    INSERT INTO events_daily (date, count)
+        SELECT date(timestamp), COUNT(*) FROM events GROUP BY 1
+    """,
+    """
+    INSERT INTO events_hourly (date, hour, count)
+        SELECT date(timestamp), strftime('%H', timestamp), COUNT(*) FROM events GROUP BY 1, 2
+    """,
+)
+
+
+# Applied to every new connection. WAL lets readers run alongside the writer,
+# and synchronous=NORMAL skips the fsync on each commit (WAL stays consistent).
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+# The subset that doesn't write to the database file
+_READ_ONLY_PRAGMAS = _PRAGMAS[2:]
+
+
+def _apply_pragmas(engine, pragmas):
+    """Run pragmas on each connection the engine opens, before it is used."""
+    @sa_event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def _use_explicit_transactions(engine):
+    """
+    Emit BEGIN ourselves instead of leaving it to the sqlite3 module.
+
+    sqlite3 only opens a transaction before DML, so a SAVEPOINT issued first
+    starts (and its release commits) a transaction of its own. Taking over
+    BEGIN makes savepoints nest inside the session's transaction.
+    """
+    @sa_event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @sa_event.listens_for(engine, "begin")
+    def on_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
 class DatabaseManager:
     """Manages database operations for event tracking."""
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, read_only: bool = False, commit_interval: float = 0,
+                 max_uncommitted: int = 500):
         """
         Initialize database connection.
 
         Args:
             db_path: Path to SQLite database file
+            read_only: Open an existing database with mode=ro, skipping schema
+                setup; several of these can read alongside the writer
+            commit_interval: If > 0, add_events() leaves rows in an open
+                transaction that a background thread commits every this many
+                seconds, trading that much durability for fewer fsyncs
+            max_uncommitted: Commit right away once this many rows are pending
         """
-        # Ensure directory exists
-        db_file = Path(db_path)
-        db_file.parent.mkdir(parents=True, exist_ok=True)
-
-        # Create engine
-        self.engine = create_engine(f'sqlite:///{db_path}', echo=False)
-
-        # Create tables
-        Base.metadata.create_all(self.engine)
-
-        # Create session factory
-        Session = sessionmaker(bind=self.engine)
-        self.session = Session()
+        if read_only:
+            uri = Path(db_path).resolve().as_uri()
+            self.engine = create_engine(f'sqlite:///{uri}?mode=ro&uri=true', echo=False)
+            _apply_pragmas(self.engine, _READ_ONLY_PRAGMAS)
+            self._write_engine = self.engine
+        else:
+            # Ensure directory exists
+            db_file = Path(db_path)
+            db_file.parent.mkdir(parents=True, exist_ok=True)
+
+            # Create engine
+            # Writes may come from a background writer thread (one at a time)
+            self.engine = create_engine(f'sqlite:///{db_path}', echo=False,
+                                        connect_args={'check_same_thread': False})
+            _apply_pragmas(self.engine, _PRAGMAS)
+
+            # Inserts get their own engine with explicit BEGIN. Queries stay on
+            # the sqlite3 module's default, which opens no transaction for a
+            # SELECT, so a reader never pins an old snapshot (or blocks WAL
+            # checkpoints) between queries.
+            self._write_engine = create_engine(f'sqlite:///{db_path}', echo=False,
+                                               connect_args={'check_same_thread': False})
+            _apply_pragmas(self._write_engine, _PRAGMAS)
+            _use_explicit_transactions(self._write_engine)
+
+            # Create tables
+            Base.metadata.create_all(self.engine)
+
+            # create_all skips indexes on tables that already exist. Look them up
+            # by name: reflection (checkfirst) can't see expression indexes.
+            with self.engine.connect() as conn:
+                existing = set(conn.execute(text(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+            for index in Event.__table__.indexes:
+                if index.name not in existing:
+                    index.create(self.engine)
+
+            self._init_rollups()
+
+        # Built once; SQLAlchemy caches its compiled form across inserts
+        self._insert_stmt = Event.__table__.insert()
+
+        # Running event counts for get_cached_counts(), loaded on first use.
+        # Guarded by _tx_lock, like the write session.
+        self._counts_date = None
+        self._today_count = 0
+        self._total_count = 0
+
+        # Timed commits: pending row count and the lock shared with the committer
+        self.commit_interval = commit_interval
+        self.max_uncommitted = max_uncommitted
+        self._tx_lock = threading.Lock()
+        self._uncommitted = 0
+        self._stop = threading.Event()
+        self._committer = None
+        if commit_interval > 0:
+            self._committer = threading.Thread(target=self._commit_loop, daemon=True)
+            self._committer.start()
+
+        # Queries get a session per thread, so e.g. the writer thread and a
+        # caller on the main thread never share one. Rows stay readable after
+        # commit without being reloaded.
+        self.Session = scoped_session(sessionmaker(bind=self.engine, expire_on_commit=False))
+        # Inserts go through one session whatever the thread: with timed
+        # commits the committer thread must commit the writer's transaction.
+        # Guarded by _tx_lock.
+        self._write_session = sessionmaker(bind=self._write_engine, expire_on_commit=False)()
+
+    @property
+    def session(self):
+        """The calling thread's session, for queries."""
+        return self.Session()
+
+    def _init_rollups(self):
+        """Install the rollup triggers, backfilling the rollups on first install."""
+        with self._write_engine.begin() as conn:
+            installed = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'events_rollup_ai'"
+            )).first()
+            if installed:
+                return
+            for statement in _ROLLUP_BACKFILL + _ROLLUP_TRIGGERS:
+                conn.execute(text(statement))
 
     def add_event(self, event, screenshot_path: str):
         """
@@ -67,23 +247,117 @@ class DatabaseManager:
             event: PhoneUsageEvent object
             screenshot_path: Path to screenshot
         """
-        try:
-            db_event = Event(
-                event_uuid=event.event_id,
-                timestamp=event.start_time,
-                screenshot_path=screenshot_path,
-                person_bbox=json.dumps(event.person_bbox),
-                phone_bbox=json.dumps(event.phone_bbox),
-                frame_count=event.frame_count
-            )
-
-            self.session.add(db_event)
-            self.session.commit()
+        return self.add_events([(event, screenshot_path)])
+
+    def add_events(self, items) -> bool:
+        """
+        Add several events in one transaction.
+
+        Rows go through a Core INSERT rather than ORM objects, skipping the
+        identity map and unit-of-work flush.
+
+        Args:
+            items: (PhoneUsageEvent, screenshot path) pairs
+
+        Returns:
+            True if all events were written, False if the batch was rolled back
+        """
+        rows = [
+            {
+                'event_uuid': event.event_id,
+                'timestamp': event.start_time,
+                'screenshot_path': screenshot_path,
+                'person_bbox': orjson.dumps(event.person_bbox).decode(),
+                'phone_bbox': orjson.dumps(event.phone_bbox).decode(),
+                'frame_count': event.frame_count,
+            }
+            for event, screenshot_path in items
+        ]
+        if not rows:
+            return True
+        if self._committer is None:
+            with self._tx_lock:
+                try:
+                    self._write_session.execute(self._insert_stmt, rows)
+                    self._write_session.commit()
+                except Exception as e:
+                    self._write_session.rollback()
+                    print(f"Error adding {len(rows)} events to database: {e}")
+                    return False
+                self._count_added(rows)
             return True
+
+        with self._tx_lock:
+            try:
+                # A savepoint so a bad batch doesn't discard other pending rows
+                with self._write_session.begin_nested():
+                    self._write_session.execute(self._insert_stmt, rows)
+            except Exception as e:
+                print(f"Error adding {len(rows)} events to database: {e}")
+                return False
+            self._uncommitted += len(rows)
+            if self._uncommitted >= self.max_uncommitted:
+                self._commit_pending()
+            self._count_added(rows)
+        return True
+
+    def _count_added(self, rows):
+        """Bump the cached counts for rows just written; call with _tx_lock held."""
+        if self._counts_date is None:
+            return
+        today = date.today()
+        if today != self._counts_date:
+            self._counts_date = today
+            self._today_count = 0
+        self._today_count += sum(1 for row in rows if row['timestamp'].date() == today)
+        self._total_count += len(rows)
+
+    def get_cached_counts(self) -> tuple:
+        """
+        Get today's and the total event count without querying per call.
+
+        The counts are read from the rollup once, then kept up to date by
+        add_events(); events written by other processes aren't reflected.
+
+        Returns:
+            (today's event count, total event count)
+        """
+        today = date.today()
+        with self._tx_lock:
+            if self._counts_date is None:
+                # Read through the write session so rows not yet committed count
+                self._today_count = self._write_session.query(
+                    func.coalesce(func.sum(DailyCount.count), 0)
+                ).filter(DailyCount.date == today.isoformat()).scalar()
+                self._total_count = self._write_session.query(
+                    func.coalesce(func.sum(DailyCount.count), 0)
+                ).scalar()
+                if self._uncommitted == 0:
+                    # Don't hold a read snapshot open until the next insert
+                    self._write_session.rollback()
+                self._counts_date = today
+            elif today != self._counts_date:
+                # Rolled over midnight
+                self._counts_date = today
+                self._today_count = 0
+            return self._today_count, self._total_count
+
+    def _commit_pending(self):
+        """Commit rows left open by add_events(); call with _tx_lock held."""
+        if self._uncommitted == 0:
+            return
+        try:
+            self._write_session.commit()
         except Exception as e:
-            self.session.rollback()
-            print(f"Error adding event to database: {e}")
-            return False
+            self._write_session.rollback()
+            print(f"Error committing {self._uncommitted} events to database: {e}")
+        self._uncommitted = 0
+
+    def _commit_loop(self):
+        """Commit pending rows every commit_interval seconds until close()."""
+        while not self._stop.wait(self.commit_interval):
+            with self._tx_lock:
+                self._commit_pending()
 
     def get_today_events(self) -> list:
         """
@@ -105,7 +379,25 @@ class DatabaseManager:
         Returns:
             Total event count
         """
-        return self.session.query(Event).count()
+        return self.session.query(func.count(Event.id)).scalar()
+
+    def count_events_by_date(self, target_date: date, until: datetime = None) -> int:
+        """
+        Count events on a specific date without loading them.
+
+        Args:
+            target_date: Date to count
+            until: If given, only count events at or before this time
+
+        Returns:
+            Number of matching events
+        """
+        query = self.session.query(func.count(Event.id)).filter(
+            func.date(Event.timestamp) == target_date
+        )
+        if until is not None:
+            query = query.filter(Event.timestamp <= until)
+        return query.scalar()
 
     def get_recent_events(self, limit: int = 10) -> list:
         """
@@ -154,6 +446,69 @@ class DatabaseManager:
         ).order_by(Event.timestamp.desc()).all()
         return events
 
+    def get_day_summary(self, target_date: date) -> dict:
+        """
+        Get aggregate metrics for a single day, computed in SQL.
+
+        Args:
+            target_date: Date to summarize
+
+        Returns:
+            Dictionary with count, total_frames, avg_frames, peak_hour
+            ("HH" or None), longest_event and latest_event (Event or None)
+        """
+        day_filter = (
+            Event.timestamp >= datetime.combine(target_date, datetime.min.time()),
+            Event.timestamp <= datetime.combine(target_date, datetime.max.time())
+        )
+
+        count, total_frames = self.session.query(
+            func.count(Event.id),
+            func.coalesce(func.sum(Event.frame_count), 0)
+        ).filter(*day_filter).one()
+
+        hour = func.strftime('%H', Event.timestamp)
+        peak = self.session.query(hour).filter(*day_filter).group_by(hour).order_by(
+            func.count(Event.id).desc(), hour
+        ).first()
+
+        longest_event = self.session.query(Event).filter(*day_filter).order_by(
+            Event.frame_count.desc(), Event.timestamp.desc()
+        ).first()
+
+        latest_event = self.session.query(Event).filter(*day_filter).order_by(
+            Event.timestamp.desc()
+        ).first()
+
+        return {
+            'count': count,
+            'total_frames': total_frames,
+            'avg_frames': total_frames / count if count > 0 else 0,
+            'peak_hour': peak[0] if peak else None,
+            'longest_event': longest_event,
+            'latest_event': latest_event
+        }
+
+    def get_daily_summary(self, target_date: date) -> tuple:
+        """
+        Get a day's event count and hourly distribution in one query.
+
+        Args:
+            target_date: Date to summarize
+
+        Returns:
+            (event count, dictionary with hour (00-23) -> count mapping)
+        """
+        results = self.session.query(HourlyCount.hour, HourlyCount.count).filter(
+            HourlyCount.date == target_date.isoformat()
+        ).all()
+
+        stats = {f"{h:02d}": 0 for h in range(24)}
+        for result in results:
+            stats[result.hour] = result.count
+
+        return sum(stats.values()), stats
+
     def get_daily_statistics(self, days: int = 7) -> dict:
         """
         Get daily event counts for the last N days.
@@ -167,14 +522,9 @@ class DatabaseManager:
         end_date = date.today()
         start_date = end_date - timedelta(days=days-1)
 
-        # Query events grouped by date
-        results = self.session.query(
-            func.date(Event.timestamp).label('date'),
-            func.count(Event.id).label('count')
-        ).filter(
-            Event.timestamp >= datetime.combine(start_date, datetime.min.time())
-        ).group_by(
-            func.date(Event.timestamp)
+        # Read per-day counts from the rollup
+        results = self.session.query(DailyCount.date, DailyCount.count).filter(
+            DailyCount.date >= start_date.isoformat()
         ).all()
 
         # Create dictionary with all dates (including zeros)
@@ -186,8 +536,7 @@ class DatabaseManager:
 
         # Fill in actual counts
         for result in results:
-            date_str = result.date if isinstance(result.date, str) else result.date.isoformat()
-            stats[date_str] = result.count
+            stats[result.date] = result.count
 
         return stats
 
@@ -204,14 +553,9 @@ class DatabaseManager:
         if target_date is None:
             target_date = date.today()
 
-        # Query events grouped by hour
-        results = self.session.query(
-            func.strftime('%H', Event.timestamp).label('hour'),
-            func.count(Event.id).label('count')
-        ).filter(
-            func.date(Event.timestamp) == target_date
-        ).group_by(
-            func.strftime('%H', Event.timestamp)
+        # Read per-hour counts from the rollup
+        results = self.session.query(HourlyCount.hour, HourlyCount.count).filter(
+            HourlyCount.date == target_date.isoformat()
         ).all()
 
         # Create dictionary with all hours (0-23)
@@ -234,10 +578,17 @@ class DatabaseManager:
         yesterday = today - timedelta(days=1)
         week_ago = today - timedelta(days=7)
 
-        today_count = len(self.get_events_by_date(today))
-        yesterday_count = len(self.get_events_by_date(yesterday))
-        week_count = len(self.get_events_date_range(week_ago, today))
-        total_count = self.get_total_events()
+        # Counts come from the daily rollup rather than loading events
+        def day_total(*filters) -> int:
+            return self.session.query(
+                func.coalesce(func.sum(DailyCount.count), 0)
+            ).filter(*filters).scalar()
+
+        today_count = day_total(DailyCount.date == today.isoformat())
+        yesterday_count = day_total(DailyCount.date == yesterday.isoformat())
+        week_count = day_total(DailyCount.date >= week_ago.isoformat(),
+                               DailyCount.date <= today.isoformat())
+        total_count = day_total()
 
         # Get first and last event
         first_event = self.session.query(Event).order_by(Event.timestamp.asc()).first()
@@ -277,5 +628,14 @@ class DatabaseManager:
         return deleted
 
     def close(self):
-        """Close database connection."""
-        self.session.close()
+        """Commit any pending rows and close database connection."""
+        if self._committer is not None:
+            self._stop.set()
+            self._committer.join()
+            self._committer = None
+        with self._tx_lock:
+            self._commit_pending()
+            self._write_session.close()
+        self.Session.remove()
+        self._write_engine.dispose()
+        self.engine.dispose()
@@ -1,7 +1,7 @@
 """Screenshot capture and storage manager."""
 
 import cv2
-import json
+import orjson
 from pathlib import Path
 from datetime import datetime
 from typing import Dict
@@ -23,17 +23,25 @@ class ScreenshotManager:
         self.quality = config.screenshot.quality
         self.save_enabled = config.screenshot.save_enabled
 
+        # Today's folder, created once per day rather than once per screenshot
+        self._current_date = None
+        self._current_folder = None
+
     def save_screenshot(self, frame: np.ndarray, event, detections: Dict) -> str:
         """
         Save screenshot and metadata.
 
+        Called from the app's writer thread, so encoding and writing here
+        don't hold up detection; a failed write raises to the caller before
+        the event is recorded with the path.
+
         Args:
             frame: Annotated frame to save
             event: PhoneUsageEvent object
             detections: Detection dictionary
 
         Returns:
-            Path to saved screenshot
+            Path the screenshot was written to
         """
         if not self.save_enabled:
             return ""
@@ -48,25 +56,36 @@ class ScreenshotManager:
         image_path = folder / f"{filename}.jpg"
         json_path = folder / f"{filename}.json"
 
-        # Save image
-        cv2.imwrite(str(image_path), frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
-
-        # Save metadata
+        # Save image and metadata
+        self._encode_and_write(frame, image_path, self.quality)
         self._save_metadata(json_path, event, detections)
 
         return str(image_path)
 
+    @staticmethod
+    def _encode_and_write(frame: np.ndarray, image_path: Path, quality: int):
+        """Encode frame as JPEG in memory and write the bytes to image_path."""
+        ok, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            raise RuntimeError(f"Error encoding screenshot: {image_path}")
+        image_path.write_bytes(buf.tobytes())
+
     def _create_date_folder(self) -> Path:
         """
         Create folder for today's date.
 
+        The folder is only created when the date changes; screenshots of the
+        same day reuse it.
+
         Returns:
             Path to today's folder
         """
-        today = datetime.now().strftime("%Y-%m-%d")
-        folder = self.base_path / today
-        folder.mkdir(parents=True, exist_ok=True)
-        return folder
+        today = datetime.now().date()
+        if today != self._current_date:
+            self._current_folder = self.base_path / today.strftime("%Y-%m-%d")
+            self._current_folder.mkdir(parents=True, exist_ok=True)
+            self._current_date = today
+        return self._current_folder
 
     def _generate_filename(self, event) -> str:
         """
@@ -99,12 +118,11 @@ class ScreenshotManager:
             'person_bbox': event.person_bbox,
             'phone_bbox': event.phone_bbox,
             'frame_count': event.frame_count,
-            'num_persons': len(detections['persons']),
-            'num_phones': len(detections['phones'])
+            'num_persons': len(detections['persons']['bbox']),
+            'num_phones': len(detections['phones']['bbox'])
         }
 
-        with open(filepath, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        filepath.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
 
     def get_screenshots_for_date(self, date: str = None) -> list:
         """
@@ -141,5 +159,4 @@ class ScreenshotManager:
         if not json_path.exists():
             return None
 
-        with open(json_path, 'r') as f:
-            return json.load(f)
+        return orjson.loads(json_path.read_bytes())
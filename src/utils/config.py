@@ -1,12 +1,25 @@
 """Configuration loader for Habit Exposer application."""
 
 import yaml
+from functools import lru_cache
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Optional
 
+# libyaml's parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
-@dataclass
+# Default to config/config.yaml relative to project root
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent.parent / "config" / "config.yaml"
+
+# Sections are frozen so the cached Config can be shared safely. They don't
+# use slots=True: that needs Python 3.10, and the supported floor is 3.8.
+
+
+@dataclass(frozen=True)
 class CameraConfig:
     """Camera configuration."""
     device_index: int
@@ -15,16 +28,21 @@ class CameraConfig:
     fps_target: int
 
 
-@dataclass
+@dataclass(frozen=True)
 class DetectionConfig:
     """Detection configuration."""
     model_size: str
     confidence_threshold: float
     device: str
     frame_skip: int
+    batch_size: int = 1
+    backend: str = "pytorch"
+    precision: str = "fp32"
+    motion_threshold: float = 0.0
+    target_fps: float = 0.0
 
 
-@dataclass
+@dataclass(frozen=True)
 class ProximityConfig:
     """Proximity detection configuration."""
     distance_threshold_pixels: float
@@ -32,7 +50,7 @@ class ProximityConfig:
     cooldown_seconds: int
 
 
-@dataclass
+@dataclass(frozen=True)
 class ScreenshotConfig:
     """Screenshot configuration."""
     save_enabled: bool
@@ -41,7 +59,7 @@ class ScreenshotConfig:
     retention_days: int
 
 
-@dataclass
+@dataclass(frozen=True)
 class DashboardConfig:
     """Dashboard configuration."""
     port: int
@@ -49,21 +67,23 @@ class DashboardConfig:
     gallery_items_per_page: int
 
 
-@dataclass
+@dataclass(frozen=True)
 class StorageConfig:
     """Storage configuration."""
     database_path: str
     screenshots_base_path: str
 
 
-@dataclass
+@dataclass(frozen=True)
 class LoggingConfig:
     """Logging configuration."""
     level: str
     file: str
+    console: bool = True
+    flush_interval: float = 1.0
 
 
-@dataclass
+@dataclass(frozen=True)
 class Config:
     """Main configuration class."""
     camera: CameraConfig
@@ -79,6 +99,9 @@ class Config:
         """
         Load configuration from YAML file.
 
+        The file is parsed once per path; later calls return the same
+        (immutable) object.
+
         Args:
             config_path: Path to config file. If None, uses default location.
 
@@ -86,27 +109,8 @@ class Config:
             Config object with loaded settings.
         """
         if config_path is None:
-            # Default to config/config.yaml relative to project root
-            project_root = Path(__file__).parent.parent.parent
-            config_path = project_root / "config" / "config.yaml"
-        else:
-            config_path = Path(config_path)
-
-        if not config_path.exists():
-            raise FileNotFoundError(f"Configuration file not found: {config_path}")
-
-        with open(config_path, 'r') as f:
-            data = yaml.safe_load(f)
-
-        return cls(
-            camera=CameraConfig(**data['camera']),
-            detection=DetectionConfig(**data['detection']),
-            proximity=ProximityConfig(**data['proximity']),
-            screenshot=ScreenshotConfig(**data['screenshot']),
-            dashboard=DashboardConfig(**data['dashboard']),
-            storage=StorageConfig(**data['storage']),
-            logging=LoggingConfig(**data['logging'])
-        )
+            config_path = DEFAULT_CONFIG_PATH
+        return _load_config(cls, Path(config_path).resolve())
 
     def save(self, config_path: Optional[str] = None):
         """
@@ -116,20 +120,40 @@ class Config:
             config_path: Path to save config file. If None, uses default location.
         """
         if config_path is None:
-            project_root = Path(__file__).parent.parent.parent
-            config_path = project_root / "config" / "config.yaml"
+            config_path = DEFAULT_CONFIG_PATH
         else:
             config_path = Path(config_path)
 
         data = {
-            'camera': self.camera.__dict__,
-            'detection': self.detection.__dict__,
-            'proximity': self.proximity.__dict__,
-            'screenshot': self.screenshot.__dict__,
-            'dashboard': self.dashboard.__dict__,
-            'storage': self.storage.__dict__,
-            'logging': self.logging.__dict__
+            'camera': asdict(self.camera),
+            'detection': asdict(self.detection),
+            'proximity': asdict(self.proximity),
+            'screenshot': asdict(self.screenshot),
+            'dashboard': asdict(self.dashboard),
+            'storage': asdict(self.storage),
+            'logging': asdict(self.logging)
         }
 
         with open(config_path, 'w') as f:
             yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+        _load_config.cache_clear()
+
+
+@lru_cache(maxsize=4)
+def _load_config(cls, config_path: Path) -> Config:
+    """Parse a config file into cls; cached per (class, resolved path)."""
+    if not config_path.exists():
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+
+    with open(config_path, 'r') as f:
+        data = yaml.load(f, Loader=SafeLoader)
+
+    return cls(
+        camera=CameraConfig(**data['camera']),
+        detection=DetectionConfig(**data['detection']),
+        proximity=ProximityConfig(**data['proximity']),
+        screenshot=ScreenshotConfig(**data['screenshot']),
+        dashboard=DashboardConfig(**data['dashboard']),
+        storage=StorageConfig(**data['storage']),
+        logging=LoggingConfig(**data['logging'])
+    )
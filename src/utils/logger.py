@@ -1,9 +1,127 @@
 """Logging utilities for Habit Exposer application."""
 
+import atexit
 import logging
+import os
+import queue
 import sys
+import threading
+import time
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+
+# Level names accepted in the config, e.g. "info" -> logging.INFO
+_LEVELS = {name: getattr(logging, name)
+           for name in ('CRITICAL', 'ERROR', 'WARNING', 'INFO', 'DEBUG')}
+
+# Loggers already returned by get_logger(), by name
+_loggers: Dict[str, logging.Logger] = {}
+
+
+def _skip_find_caller(stack_info=False, stacklevel=1):
+    """
+    Stand-in for Logger.findCaller that doesn't walk the stack.
+
+    LineFormatter never prints the file, line or function, so the frame walk
+    Logger._log does for every record is wasted; stack_info is not recorded.
+    """
+    return "(unknown file)", 0, "(unknown function)", None
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses the formatted time for records in the same second."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (whole second, date format, formatted time) of the last record
+        self._last_time = (None, None, '')
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if not datefmt:
+            # The default format includes milliseconds, so it can't be reused
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        last_second, last_datefmt, formatted = self._last_time
+        if second != last_second or datefmt != last_datefmt:
+            formatted = time.strftime(datefmt, self.converter(second))
+            self._last_time = (second, datefmt, formatted)
+        return formatted
+
+
+class LineFormatter(CachedTimeFormatter):
+    """
+    Formats '%(asctime)s - %(name)s - %(levelname)s - %(message)s' directly.
+
+    The ' - name - LEVEL - ' part is built once per logger name and level and
+    then concatenated, instead of expanding the format string per record.
+    """
+
+    def __init__(self, datefmt: Optional[str] = None):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt)
+        self._prefixes = {}
+
+    def format(self, record: logging.LogRecord) -> str:
+        key = (record.name, record.levelno)
+        prefix = self._prefixes.get(key)
+        if prefix is None:
+            prefix = self._prefixes[key] = f" - {record.name} - {record.levelname} - "
+        line = self.formatTime(record, self.datefmt) + prefix + record.getMessage()
+
+        # Tracebacks and stack info as the stock formatter appends them
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        if record.stack_info:
+            line = f"{line}\n{self.formatStack(record.stack_info)}"
+        return line
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that lets records collect in a 64 KB buffer.
+
+    The stock handler flushes after every record, one write() each; here the
+    buffer is written out when it fills, on ERROR and above, and on close.
+    The file itself is opened by the first record, so a run that never logs
+    to it doesn't create it.
+    """
+
+    def __init__(self, filename, mode='a', encoding=None):
+        super().__init__(filename, mode, encoding=encoding, delay=True)
+
+    buffer_size = 65536
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+            return
+        if record.levelno >= logging.ERROR:
+            self.flush()
+
+
+def _use_formatter(handler: logging.Handler, formatter: logging.Formatter):
+    """Set handler's formatter and call its format() directly, skipping Handler.format."""
+    handler.setFormatter(formatter)
+    handler.format = formatter.format
+
+
+def _flush_periodically(handlers, interval: float, stop: threading.Event):
+    """Flush handlers every interval seconds until stop is set."""
+    while not stop.wait(interval):
+        for handler in handlers:
+            handler.flush()
 
 
 def setup_logger(config=None, name: str = "habit_exposer") -> logging.Logger:
@@ -20,38 +138,96 @@ def setup_logger(config=None, name: str = "habit_exposer") -> logging.Logger:
     logger = logging.getLogger(name)
 
     # Get log level and file from config or use defaults
-    if config and hasattr(config, 'logging'):
-        log_level = getattr(logging, config.logging.level.upper(), logging.INFO)
+    if config is not None:
+        log_level = _LEVELS.get(config.logging.level.upper(), logging.INFO)
         log_file = config.logging.file
+        console = config.logging.console
+        flush_interval = config.logging.flush_interval
     else:
         log_level = logging.INFO
         log_file = "habit_exposer.log"
+        console = True
+        flush_interval = 1.0
+
+    # Already set up for this file and level: keep the open handlers
+    setup = (os.path.abspath(log_file), log_level, console, flush_interval)
+    if logger.handlers and getattr(logger, '_log_setup', None) == setup:
+        return logger
 
+    # The only level check: records below it are dropped before a LogRecord
+    # is even created, so the handlers don't repeat it
     logger.setLevel(log_level)
+    # Records are handled here only, not again by root handlers, and without
+    # looking up the calling frame
+    logger.propagate = False
+    logger.findCaller = _skip_find_caller
 
-    # Remove existing handlers
+    # Remove existing handlers, stopping the thread that served them
     logger.handlers.clear()
+    old_flush_stop = getattr(logger, '_flush_stop', None)
+    if old_flush_stop is not None:
+        old_flush_stop.set()
+    old_listener = getattr(logger, '_listener', None)
+    if old_listener is not None:
+        old_listener.stop()
+        atexit.unregister(old_listener.stop)
+        for handler in old_listener.handlers:
+            handler.close()
 
     # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    formatter = LineFormatter(datefmt='%Y-%m-%d %H:%M:%S')
 
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(log_level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = []
+
+    # Console handler (optional, e.g. off for file-only deployments)
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        _use_formatter(console_handler, formatter)
+        handlers.append(console_handler)
 
     # File handler
     try:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(log_level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        # The file is opened lazily, so check up front that it can be
+        log_dir = os.path.dirname(os.path.abspath(log_file))
+        if not os.access(log_dir, os.W_OK):
+            raise PermissionError(f"{log_dir} is missing or not writable")
+        file_handler = BufferedFileHandler(log_file)
+        _use_formatter(file_handler, formatter)
+        # Hold records in memory and hand them to the file in bulk; errors
+        # go out right away, and whatever is left when logging shuts down
+        file_batcher = MemoryHandler(capacity=1000, flushLevel=logging.ERROR,
+                                     target=file_handler, flushOnClose=True)
+        handlers.append(file_batcher)
+        file_error = None
+
+        # Batched records reach the disk at least every flush_interval seconds,
+        # without a flush per record (batcher first, then the file buffer)
+        flush_stop = threading.Event()
+        threading.Thread(target=_flush_periodically,
+                         args=((file_batcher, file_handler), flush_interval, flush_stop),
+                         daemon=True).start()
+        logger._flush_stop = flush_stop
     except Exception as e:
-        logger.warning(f"Could not create file handler for {log_file}: {e}")
+        file_error = e
+        if not handlers:
+            # Nowhere else to log to, so use the console after all
+            console_handler = logging.StreamHandler(sys.stdout)
+            _use_formatter(console_handler, formatter)
+            handlers.append(console_handler)
+
+    # Callers only enqueue records; a listener thread formats and writes them
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers)
+    listener.start()
+    # Registered after logging's own shutdown hook, so it runs first and
+    # drains the queue before the handlers are flushed and closed
+    atexit.register(listener.stop)
+    logger._listener = listener
+    logger._log_setup = setup
+    logger.addHandler(QueueHandler(log_queue))
+
+    if file_error is not None:
+        logger.warning(f"Could not create file handler for {log_file}: {file_error}")
 
     return logger
 
@@ -66,7 +242,12 @@ def get_logger(name: str = "habit_exposer") -> logging.Logger:
     Returns:
         Logger instance.
     """
+    logger = _loggers.get(name)
+    if logger is not None:
+        return logger
+
     logger = logging.getLogger(name)
     if not logger.handlers:
         logger = setup_logger(name=name)
+    _loggers[name] = logger
     return logger